@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends
 from typing import Dict, Any
 
-from app.schemas.dashboard import DashboardStats, RecentActivity
+from app.schemas.dashboard import DashboardStats, RecentActivity, DashboardResponse
 from app.services.dashboard_service import EventService
 from app.dependencies.permissions import require_organizer
 
@@ -9,6 +9,19 @@ from app.dependencies.permissions import require_organizer
 router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
 
+@router.get("", response_model=DashboardResponse)
+async def get_dashboard(
+    current_user: Dict[str, Any] = Depends(require_organizer),
+    limit: int = 10
+) -> DashboardResponse:
+    
+    dashboard = EventService.get_dashboard(
+        organizer_id=current_user["user_id"],
+        activity_limit=limit
+    )
+    return DashboardResponse(**dashboard)
+
+
 @router.get("/stats", response_model=DashboardStats)
 async def get_dashboard_stats(
     current_user: Dict[str, Any] = Depends(require_organizer)
@@ -1,22 +1,43 @@
-from fastapi import APIRouter, Depends, status, UploadFile, File, Form
+from fastapi import APIRouter, Depends, status, UploadFile, File, Form, HTTPException, Request, Response
 from typing import List, Dict, Any, Optional
+from pydantic import TypeAdapter
 import json
 
-from app.schemas.event import EventCreate, EventUpdate, EventResponse
-from app.services.event_service import EventService
-from app.services.image_service import upload_event_image, upload_event_images as process_image_uploads
-from app.schemas.images import ImageUploadResponse
+from app.schemas.event import EventCreate, EventUpdate, EventResponse, EventCreateResponse
+from app.schemas.ticket_type import TicketTypeCreate
+from app.services.event_service import EventService, EVENT_VERSION_FIELDS
+from app.services.image_service import (
+    upload_event_image,
+    upload_event_images as process_image_uploads,
+    store_images,
+    attach_stored_image,
+    create_signed_uploads,
+    confirm_signed_uploads,
+    delete_event_images
+)
+from app.schemas.images import (
+    ImageUploadResponse,
+    SignedUploadRequest,
+    SignedUploadResponse,
+    ImageConfirmRequest,
+    ImageDeleteRequest,
+    ImageDeleteResponse
+)
 from app.dependencies.permissions import require_organizer
+from app.utils.etag import compute_etag, etag_matches
+from app.utils.responses import json_response
 
 
 router = APIRouter(prefix="/events", tags=["Events"])
 
+_event_list_adapter = TypeAdapter(List[EventResponse])
+
 
 @router.post(
     "",
-    response_model=EventResponse,
+    response_model=EventCreateResponse,
     status_code=status.HTTP_201_CREATED,
-    summary="Create a new event with optional images"
+    summary="Create a new event with optional images and ticket types"
 )
 async def create_event(
     title: str = Form(...),
@@ -27,9 +48,10 @@ async def create_event(
     capacity: Optional[int] = Form(None),
     ticket_price: Optional[float] = Form(None),
     category: Optional[str] = Form(None),
+    ticket_types: Optional[str] = Form(None, description="JSON list of ticket types to create with the event"),
     images: List[UploadFile] = File(None),
     current_user: Dict[str, Any] = Depends(require_organizer)
-) -> EventResponse:
+) -> EventCreateResponse:
     
     # Create event data object
     event_data = EventCreate(
@@ -43,30 +65,44 @@ async def create_event(
         category=category
     )
     
-    # Create event first
-    event = EventService.create_event(
+    try:
+        ticket_type_data = [
+            TicketTypeCreate(**t) for t in json.loads(ticket_types or "[]")
+        ]
+    except (ValueError, TypeError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Invalid ticket_types: {str(e)}"
+        )
+    
+    # Cheap checks first, so a request that will be rejected uploads nothing
+    EventService.validate_event_details(event_data, ticket_type_data)
+    
+    # Images are content-addressed per organizer, so they can be stored
+    # concurrently before the event row exists
+    stored_images = []
+    if images and len(images) > 0:
+        upload_result = await store_images(
+            files=images,
+            organizer_id=current_user["user_id"]
+        )
+        stored_images = upload_result["stored"]
+        for failure in upload_result["failed"]:
+            # If an image fails, the event is still created without it
+            print(f"Image upload failed for {failure['filename']}: {failure['error']}")
+    
+    # Event, image URLs and ticket types are written in one transaction
+    event = EventService.create_event_with_details(
         event_data=event_data,
-        organizer_id=current_user["user_id"]
+        organizer_id=current_user["user_id"],
+        image_urls=[stored["url"] for stored in stored_images],
+        ticket_types=ticket_type_data
     )
     
-    # Upload images if provided
-    if images and len(images) > 0:
-        try:
-            image_urls = await process_image_uploads(
-                event_id=event["id"],
-                files=images
-            )
-            
-            # Update event with image URLs
-            event = EventService.update_event_images(
-                event_id=event["id"],
-                image_urls=image_urls
-            )
-        except Exception as e:
-            # If image upload fails, event is still created but without images
-            print(f"Image upload failed: {str(e)}")
+    for stored in stored_images:
+        attach_stored_image(event["id"], current_user["user_id"], stored)
     
-    return EventResponse(**event)
+    return EventCreateResponse(**event)
 
 
 @router.get(
@@ -75,13 +111,27 @@ async def create_event(
     summary="Get my events"
 )
 async def get_my_events(
+    request: Request,
     current_user: Dict[str, Any] = Depends(require_organizer)
 ) -> List[EventResponse]:
     
+    # Answer revalidations from version columns only
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        etag = EventService.get_organizer_events_etag(
+            organizer_id=current_user["user_id"]
+        )
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    
     events = EventService.get_organizer_events(
         organizer_id=current_user["user_id"]
     )
-    return [EventResponse(**event) for event in events]
+    return json_response(
+        _event_list_adapter,
+        events,
+        headers={"ETag": compute_etag(events, EVENT_VERSION_FIELDS)}
+    )
 
 
 @router.get(
@@ -91,13 +141,26 @@ async def get_my_events(
 )
 async def get_event(
     event_id: str,
+    request: Request,
+    response: Response,
     current_user: Dict[str, Any] = Depends(require_organizer)
 ) -> EventResponse:
     
+    # Answer revalidations from version columns only
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        etag = EventService.get_event_etag(
+            event_id=event_id,
+            user_id=current_user["user_id"]
+        )
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    
     event = EventService.get_event_by_id_with_auth(
         event_id=event_id,
         user_id=current_user["user_id"]
     )
+    response.headers["ETag"] = compute_etag([event], EVENT_VERSION_FIELDS)
     return EventResponse(**event)
 
 
@@ -148,19 +211,94 @@ async def upload_event_images(
     current_user: Dict[str, Any] = Depends(require_organizer)
 ) -> ImageUploadResponse:
     
+    # Ownership is checked by the same call that records the images
+    upload_result = await process_image_uploads(
+        event_id=event_id,
+        files=files,
+        organizer_id=current_user["user_id"]
+    )
+    
+    response = ImageUploadResponse(
+        event_id=event_id,
+        image_urls=upload_result["image_urls"],
+        failed=upload_result["failed"]
+    )
+    if upload_result["failed"]:
+        response.message = f"{len(upload_result['failed'])} of {len(files)} images failed to upload"
+    
+    return response
+
+
+@router.post(
+    "/{event_id}/images/upload-urls",
+    response_model=SignedUploadResponse,
+    summary="Get signed URLs to upload event images directly to storage"
+)
+async def create_image_upload_urls(
+    event_id: str,
+    body: SignedUploadRequest,
+    current_user: Dict[str, Any] = Depends(require_organizer)
+) -> SignedUploadResponse:
+    
     # Verify event ownership
     EventService.verify_event_ownership(
         event_id=event_id,
         organizer_id=current_user["user_id"]
     )
     
-    # Upload images
-    image_urls = await process_image_uploads(
+    uploads = await create_signed_uploads(
+        event_id=event_id,
+        files=[f.model_dump() for f in body.files]
+    )
+    
+    return SignedUploadResponse(event_id=event_id, uploads=uploads)
+
+
+@router.post(
+    "/{event_id}/images/confirm",
+    response_model=ImageUploadResponse,
+    summary="Record images uploaded through signed URLs"
+)
+async def confirm_image_uploads(
+    event_id: str,
+    body: ImageConfirmRequest,
+    current_user: Dict[str, Any] = Depends(require_organizer)
+) -> ImageUploadResponse:
+    
+    # Ownership is checked by the same call that records the images
+    confirm_result = await confirm_signed_uploads(
+        event_id=event_id,
+        organizer_id=current_user["user_id"],
+        paths=body.paths
+    )
+    
+    response = ImageUploadResponse(
         event_id=event_id,
-        files=files
+        image_urls=confirm_result["image_urls"],
+        failed=confirm_result["failed"]
     )
+    if confirm_result["failed"]:
+        response.message = f"{len(confirm_result['failed'])} of {len(body.paths)} images could not be confirmed"
     
-    return ImageUploadResponse(
+    return response
+
+
+@router.post(
+    "/{event_id}/images/delete",
+    response_model=ImageDeleteResponse,
+    summary="Delete several event images at once"
+)
+async def delete_images(
+    event_id: str,
+    body: ImageDeleteRequest,
+    current_user: Dict[str, Any] = Depends(require_organizer)
+) -> ImageDeleteResponse:
+    
+    # Ownership is enforced inside the removal itself
+    delete_result = await delete_event_images(
         event_id=event_id,
-        image_urls=image_urls
-    )
\ No newline at end of file
+        organizer_id=current_user["user_id"],
+        image_urls=body.image_urls
+    )
+    
+    return ImageDeleteResponse(**delete_result)
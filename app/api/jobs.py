@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends
+from typing import Dict, Any
+
+from app.schemas.job import JobResponse
+from app.services.job_service import JobService
+from app.dependencies.permissions import require_organizer
+
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+
+@router.get(
+    "/{job_id}",
+    response_model=JobResponse,
+    summary="Poll the progress of a background bulk operation"
+)
+async def get_job(
+    job_id: str,
+    current_user: Dict[str, Any] = Depends(require_organizer)
+):
+    job = JobService.get(
+        job_id=job_id,
+        organizer_id=current_user["user_id"]
+    )
+    return JobResponse(**job)
@@ -1,18 +1,39 @@
 # ADD TO: organizer backend → app/api/scanning.py
 
-from fastapi import APIRouter, Depends, status
-from typing import Dict, Any
+from fastapi import APIRouter, Depends, status, Query, UploadFile, File, Form
+from fastapi.concurrency import run_in_threadpool
+from typing import Dict, Any, Optional
+from datetime import datetime
+from pydantic import TypeAdapter
 
 from app.schemas.scan import (
     ScanTicketRequest, ScanTicketResponse,
     AttendeeListResponse, OrderListResponse,
-    EventStatsResponse, TicketListResponse, TicketDetailResponse
+    EventStatsResponse, TicketListResponse, TicketDetailResponse,
+    EventStatsBatchRequest, EventStatsBatchResponse,
+    GateLookupResponse, GateSessionResponse, OrderSearchResponse,
+    TicketBatchRequest, TicketBatchResponse, BulkCancelRequest,
+    GuestListImportResponse
 )
+from app.schemas.job import JobResponse
 from app.services.scan_service import ScanService
+from app.services.gate_lookup_service import GateLookupService
+from app.services.cancellation_service import CancellationService
+from app.services.import_service import ImportService
 from app.dependencies.permissions import require_organizer
+from app.utils.responses import json_response
 
 router = APIRouter(tags=["Scanning & Tickets"])
 
+# Built once and reused; large list payloads skip FastAPI's second validation
+_event_stats_adapter = TypeAdapter(EventStatsResponse)
+_event_stats_batch_adapter = TypeAdapter(EventStatsBatchResponse)
+_attendee_list_adapter = TypeAdapter(AttendeeListResponse)
+_order_list_adapter = TypeAdapter(OrderListResponse)
+_order_search_adapter = TypeAdapter(OrderSearchResponse)
+_ticket_list_adapter = TypeAdapter(TicketListResponse)
+_ticket_batch_adapter = TypeAdapter(TicketBatchResponse)
+
 
 # ── Scan ─────────────────────────────────────────────────────────────────────
 
@@ -34,6 +55,44 @@ async def scan_ticket(
     return ScanTicketResponse(**result)
 
 
+# ── Gate Lookup ───────────────────────────────────────────────────────────────
+
+@router.post(
+    "/events/{event_id}/lookup/session",
+    response_model=GateSessionResponse,
+    summary="Start a scanning session and build the event's lookup index"
+)
+async def start_gate_session(
+    event_id: str,
+    current_user: Dict[str, Any] = Depends(require_organizer)
+):
+    result = GateLookupService.start_session(
+        event_id=event_id,
+        organizer_id=current_user["user_id"]
+    )
+    return GateSessionResponse(**result)
+
+
+@router.get(
+    "/events/{event_id}/lookup",
+    response_model=GateLookupResponse,
+    summary="Find tickets by email, order reference or the end of the ticket ID"
+)
+async def gate_lookup(
+    event_id: str,
+    q: str = Query(..., min_length=2, max_length=200),
+    limit: int = Query(10, ge=1, le=50),
+    current_user: Dict[str, Any] = Depends(require_organizer)
+):
+    result = GateLookupService.lookup(
+        event_id=event_id,
+        organizer_id=current_user["user_id"],
+        query=q,
+        limit=limit
+    )
+    return GateLookupResponse(**result)
+
+
 # ── Event Stats ───────────────────────────────────────────────────────────────
 
 @router.get(
@@ -49,7 +108,23 @@ async def get_event_stats(
         event_id=event_id,
         organizer_id=current_user["user_id"]
     )
-    return EventStatsResponse(**result)
+    return json_response(_event_stats_adapter, result)
+
+
+@router.post(
+    "/events/stats:batch",
+    response_model=EventStatsBatchResponse,
+    summary="Get stats for up to 100 events in one request"
+)
+async def get_event_stats_batch(
+    body: EventStatsBatchRequest,
+    current_user: Dict[str, Any] = Depends(require_organizer)
+):
+    result = ScanService.get_event_stats_batch(
+        event_ids=body.event_ids,
+        organizer_id=current_user["user_id"]
+    )
+    return json_response(_event_stats_batch_adapter, result)
 
 
 # ── Attendees ─────────────────────────────────────────────────────────────────
@@ -61,13 +136,18 @@ async def get_event_stats(
 )
 async def get_event_attendees(
     event_id: str,
+    updated_since: Optional[datetime] = Query(
+        None,
+        description="Only return tickets created, cancelled or checked in since this watermark"
+    ),
     current_user: Dict[str, Any] = Depends(require_organizer)
 ):
     result = ScanService.get_event_attendees(
         event_id=event_id,
-        organizer_id=current_user["user_id"]
+        organizer_id=current_user["user_id"],
+        updated_since=updated_since.isoformat() if updated_since else None
     )
-    return AttendeeListResponse(**result)
+    return json_response(_attendee_list_adapter, result)
 
 
 # ── Orders ────────────────────────────────────────────────────────────────────
@@ -85,7 +165,27 @@ async def get_event_orders(
         event_id=event_id,
         organizer_id=current_user["user_id"]
     )
-    return OrderListResponse(**result)
+    return json_response(_order_list_adapter, result)
+
+
+@router.get(
+    "/orders/search",
+    response_model=OrderSearchResponse,
+    summary="Find orders by reference or customer email across all organizer events"
+)
+async def search_orders(
+    reference: Optional[str] = Query(None, max_length=100, description="Exact order reference"),
+    customer_email: Optional[str] = Query(None, max_length=320, description="Case-insensitive exact email match"),
+    limit: int = Query(50, ge=1, le=200),
+    current_user: Dict[str, Any] = Depends(require_organizer)
+):
+    result = ScanService.search_orders(
+        organizer_id=current_user["user_id"],
+        reference=reference,
+        customer_email=customer_email,
+        limit=limit
+    )
+    return json_response(_order_search_adapter, result)
 
 
 # ── All Tickets ───────────────────────────────────────────────────────────────
@@ -93,15 +193,47 @@ async def get_event_orders(
 @router.get(
     "/tickets",
     response_model=TicketListResponse,
-    summary="Get all tickets across all organizer events"
+    summary="Get tickets across all organizer events, filtered server-side"
 )
 async def get_all_tickets(
+    event_id: Optional[str] = Query(None, description="Only tickets for this event"),
+    ticket_status: Optional[str] = Query(None, alias="status", description="active, used or cancelled"),
+    ticket_type: Optional[str] = Query(None, description="Ticket type name"),
+    created_from: Optional[datetime] = Query(None, description="Created at or after this time"),
+    created_to: Optional[datetime] = Query(None, description="Created before this time"),
+    customer_email: Optional[str] = Query(None, description="Case-insensitive exact email match"),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Page size; total then counts all matches"),
+    offset: int = Query(0, ge=0),
     current_user: Dict[str, Any] = Depends(require_organizer)
 ):
     result = ScanService.get_all_tickets(
+        organizer_id=current_user["user_id"],
+        event_id=event_id,
+        ticket_status=ticket_status,
+        ticket_type=ticket_type,
+        created_from=created_from.isoformat() if created_from else None,
+        created_to=created_to.isoformat() if created_to else None,
+        customer_email=customer_email,
+        limit=limit,
+        offset=offset
+    )
+    return json_response(_ticket_list_adapter, result)
+
+
+@router.post(
+    "/tickets:batch",
+    response_model=TicketBatchResponse,
+    summary="Get up to 500 tickets by ID in one request"
+)
+async def get_tickets_batch(
+    body: TicketBatchRequest,
+    current_user: Dict[str, Any] = Depends(require_organizer)
+):
+    result = ScanService.get_tickets_batch(
+        ticket_ids=body.ticket_ids,
         organizer_id=current_user["user_id"]
     )
-    return TicketListResponse(**result)
+    return json_response(_ticket_batch_adapter, result)
 
 
 @router.get(
@@ -118,3 +250,50 @@ async def get_ticket(
         organizer_id=current_user["user_id"]
     )
     return TicketDetailResponse(**result)
+
+
+# ── Bulk Cancellation ─────────────────────────────────────────────────────────
+
+@router.post(
+    "/events/{event_id}/tickets:cancel",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Cancel an event's tickets in bulk as a background job"
+)
+async def bulk_cancel_tickets(
+    event_id: str,
+    body: BulkCancelRequest,
+    current_user: Dict[str, Any] = Depends(require_organizer)
+):
+    job = CancellationService.start_bulk_cancel(
+        event_id=event_id,
+        organizer_id=current_user["user_id"],
+        ticket_type_id=body.ticket_type_id,
+        ticket_ids=body.ticket_ids
+    )
+    return JobResponse(**job)
+
+
+# ── Guest-List Import ─────────────────────────────────────────────────────────
+
+@router.post(
+    "/events/{event_id}/tickets:import",
+    response_model=GuestListImportResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Import comp and guest-list tickets from a CSV of email,ticket_type rows"
+)
+async def import_guest_list(
+    event_id: str,
+    file: UploadFile = File(..., description="CSV with email and ticket_type columns"),
+    generate_qr: bool = Form(False, description="Render QR codes in a background job"),
+    current_user: Dict[str, Any] = Depends(require_organizer)
+):
+    # Reads the spooled upload line by line; keep the blocking inserts off the event loop
+    result = await run_in_threadpool(
+        ImportService.import_guest_list,
+        event_id=event_id,
+        organizer_id=current_user["user_id"],
+        file=file.file,
+        generate_qr=generate_qr
+    )
+    return GuestListImportResponse(**result)
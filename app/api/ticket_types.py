@@ -1,11 +1,15 @@
 # ADD THIS FILE TO: your organizer backend → app/api/ticket_types.py
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, status, Request, Response
 from typing import List, Dict, Any
 
-from app.schemas.ticket_type import TicketTypeCreate, TicketTypeUpdate, TicketTypeResponse
-from app.services.ticket_type_service import TicketTypeService
+from app.schemas.ticket_type import (
+    TicketTypeCreate, TicketTypeUpdate, TicketTypeResponse,
+    TicketTypeBulkCreate, TicketTypeBulkUpdate
+)
+from app.services.ticket_type_service import TicketTypeService, TICKET_TYPE_VERSION_FIELDS
 from app.dependencies.permissions import require_organizer
+from app.utils.etag import compute_etag, etag_matches
 
 router = APIRouter(
     prefix="/events/{event_id}/ticket-types",
@@ -43,12 +47,65 @@ async def create_ticket_type(
 )
 async def get_ticket_types(
     event_id: str,
+    request: Request,
+    response: Response,
     current_user: Dict[str, Any] = Depends(require_organizer)
 ):
+    # Answer revalidations from version columns only
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        etag = TicketTypeService.get_ticket_types_etag(
+            event_id=event_id,
+            organizer_id=current_user["user_id"]
+        )
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
     results = TicketTypeService.get_ticket_types(
         event_id=event_id,
         organizer_id=current_user["user_id"]
     )
+    response.headers["ETag"] = compute_etag(results, TICKET_TYPE_VERSION_FIELDS)
+    return [TicketTypeResponse(**r) for r in results]
+
+
+# Bulk routes must be registered before "/{ticket_type_id}" so "bulk" is not
+# taken for an id
+
+@router.post(
+    "/bulk",
+    response_model=List[TicketTypeResponse],
+    status_code=status.HTTP_201_CREATED,
+    summary="Create many ticket types for an event at once"
+)
+async def bulk_create_ticket_types(
+    event_id: str,
+    body: TicketTypeBulkCreate,
+    current_user: Dict[str, Any] = Depends(require_organizer)
+):
+    results = TicketTypeService.bulk_create_ticket_types(
+        event_id=event_id,
+        organizer_id=current_user["user_id"],
+        ticket_types=[t.model_dump() for t in body.ticket_types]
+    )
+    return [TicketTypeResponse(**r) for r in results]
+
+
+@router.patch(
+    "/bulk",
+    response_model=List[TicketTypeResponse],
+    summary="Update many ticket types for an event at once"
+)
+async def bulk_update_ticket_types(
+    event_id: str,
+    body: TicketTypeBulkUpdate,
+    current_user: Dict[str, Any] = Depends(require_organizer)
+):
+    results = TicketTypeService.bulk_update_ticket_types(
+        event_id=event_id,
+        organizer_id=current_user["user_id"],
+        updates=[t.model_dump(exclude_none=True) for t in body.ticket_types]
+    )
     return [TicketTypeResponse(**r) for r in results]
 
 
@@ -11,6 +11,42 @@ class Settings(BaseSettings):
     SUPABASE_SERVICE_ROLE_KEY: str
     SUPABASE_JWT_SECRET: str
 
+    # Max parallel Supabase queries issued by a single fan-out
+    DB_FANOUT_WORKERS: int = 16
+
+    # Recent-activity entries kept in memory per organizer
+    ACTIVITY_BUFFER_SIZE: int = 50
+
+    STORAGE_BUCKET_NAME: str = "event-images"
+
+    # Max files uploaded to storage in parallel per request
+    IMAGE_UPLOAD_CONCURRENCY: int = 4
+    MAX_IMAGE_SIZE_BYTES: int = 5 * 1024 * 1024
+    IMAGE_UPLOAD_CHUNK_BYTES: int = 64 * 1024
+
+    # Worker processes rendering thumbnail/card/hero variants
+    IMAGE_PROCESS_WORKERS: int = 2
+
+    # Gate lookup indexes: background catch-up interval, and how long an
+    # unused event index is kept in memory
+    GATE_INDEX_REFRESH_SECONDS: float = 2.0
+    GATE_INDEX_IDLE_SECONDS: int = 6 * 60 * 60
+
+    # Concurrent bulk jobs per worker, and tickets updated per statement
+    # (ids travel in the request URL, so keep chunks to a few hundred)
+    BULK_JOB_WORKERS: int = 2
+    BULK_CANCEL_CHUNK_SIZE: int = 200
+
+    # Guest-list CSV imports: tickets per multi-row insert, and rows per file
+    IMPORT_BATCH_SIZE: int = 500
+    IMPORT_MAX_ROWS: int = 50_000
+
+    # Response compression: bodies under the threshold are sent as-is;
+    # lower levels trade bandwidth for CPU
+    COMPRESSION_MIN_SIZE: int = 1400
+    GZIP_LEVEL: int = 6
+    BROTLI_QUALITY: int = 4
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -1,6 +1,8 @@
 from pydantic import BaseModel, Field, ConfigDict
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Dict
+
+from app.schemas.ticket_type import TicketTypeResponse
 
 
 class EventCreate(BaseModel):
@@ -40,7 +42,14 @@ class EventResponse(BaseModel):
     category: Optional[str]
     organizer_id: str
     image_urls: Optional[list[str]] = []
+    # {original_url: {"thumbnail" | "card" | "hero": {"jpg" | "webp": url}}}
+    image_variants: Optional[Dict[str, Dict[str, Dict[str, str]]]] = {}
     created_at: str
     updated_at: Optional[str]
     
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+
+class EventCreateResponse(EventResponse):
+    """Schema for a newly created event with its ticket types"""
+    ticket_types: list[TicketTypeResponse] = []
@@ -2,14 +2,57 @@ from pydantic import BaseModel, Field
 from typing import List
 
 
+class ImageUploadFailure(BaseModel):
+    """A single file that could not be uploaded"""
+    filename: str
+    error: str
+
+
 class ImageUploadResponse(BaseModel):
     """Schema for image upload response"""
     event_id: str
     image_urls: List[str] = Field(..., description="Public URLs of uploaded images")
+    failed: List[ImageUploadFailure] = Field(default=[], description="Files that failed to upload")
     message: str = "Images uploaded successfully"
 
 
+class ImageDeleteRequest(BaseModel):
+    """Schema for deleting several event images at once"""
+    image_urls: List[str] = Field(..., min_length=1, max_length=100)
+
+
 class ImageDeleteResponse(BaseModel):
     """Schema for image deletion response"""
     message: str = "Images deleted successfully"
-    deleted_count: int
\ No newline at end of file
+    deleted_count: int
+    image_urls: List[str] = Field(default=[], description="Image URLs remaining on the event")
+
+
+class SignedUploadFile(BaseModel):
+    """A file the client intends to upload directly to storage"""
+    filename: str = Field(..., min_length=1, max_length=255)
+    content_type: str = Field(..., description="image/jpeg, image/png, image/gif or image/webp")
+
+
+class SignedUploadRequest(BaseModel):
+    """Schema for requesting signed upload URLs"""
+    files: List[SignedUploadFile] = Field(..., min_length=1, max_length=10)
+
+
+class SignedUploadTarget(BaseModel):
+    """Where and how to upload a single file"""
+    filename: str
+    path: str = Field(..., description="Storage path to pass back to the confirm endpoint")
+    signed_url: str = Field(..., description="Short-lived URL to PUT the file bytes to")
+    token: str
+
+
+class SignedUploadResponse(BaseModel):
+    """Schema for signed upload URL response"""
+    event_id: str
+    uploads: List[SignedUploadTarget]
+
+
+class ImageConfirmRequest(BaseModel):
+    """Schema for confirming finished direct uploads"""
+    paths: List[str] = Field(..., min_length=1, max_length=10)
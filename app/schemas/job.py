@@ -0,0 +1,17 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+
+
+class JobResponse(BaseModel):
+    """Progress of a background bulk operation"""
+    id: str
+    event_id: str
+    kind: str = Field(..., description="e.g. ticket_cancellation")
+    status: str = Field(..., description="queued, running, completed or failed")
+    total: Optional[int] = Field(None, description="Items in scope when the job started")
+    processed: int = Field(0, description="Items completed so far")
+    failed: int = Field(0, description="Items skipped or rejected")
+    error: Optional[str] = None
+    created_at: str
+    updated_at: str
+    finished_at: Optional[str] = None
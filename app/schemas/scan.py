@@ -1,6 +1,6 @@
 # ADD TO: organizer backend → app/schemas/scan.py
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
 
 
@@ -34,6 +34,22 @@ class AttendeeListResponse(BaseModel):
     total: int
     checked_in: int
     pending: int
+    # Latest tickets.updated_at covered by this response; pass back as updated_since
+    watermark: Optional[str] = None
+
+
+class GateLookupResult(AttendeeResponse):
+    order_reference: Optional[str] = None
+
+
+class GateLookupResponse(BaseModel):
+    results: List[GateLookupResult]
+    total: int
+
+
+class GateSessionResponse(BaseModel):
+    event_id: str
+    indexed: int
 
 
 class OrderItemResponse(BaseModel):
@@ -55,6 +71,16 @@ class OrderListResponse(BaseModel):
     total_revenue: float
 
 
+class OrderSearchItemResponse(OrderItemResponse):
+    event_id: str
+    event_title: Optional[str] = None
+
+
+class OrderSearchResponse(BaseModel):
+    orders: List[OrderSearchItemResponse]
+    total: int
+
+
 class EventStatsResponse(BaseModel):
     event_id: str
     event_title: str
@@ -68,6 +94,15 @@ class EventStatsResponse(BaseModel):
     ticket_type_breakdown: List[Dict[str, Any]]
 
 
+class EventStatsBatchRequest(BaseModel):
+    event_ids: List[str] = Field(..., min_length=1, max_length=100)
+
+
+class EventStatsBatchResponse(BaseModel):
+    stats: List[EventStatsResponse]
+    missing_event_ids: List[str] = []
+
+
 class TicketDetailResponse(BaseModel):
     id: str
     event_id: str
@@ -85,3 +120,34 @@ class TicketDetailResponse(BaseModel):
 class TicketListResponse(BaseModel):
     tickets: List[TicketDetailResponse]
     total: int
+
+
+class TicketBatchRequest(BaseModel):
+    ticket_ids: List[str] = Field(..., min_length=1, max_length=500)
+
+
+class TicketBatchResponse(BaseModel):
+    tickets: List[TicketDetailResponse]
+    # Unknown ids and ids on other organizers' events
+    missing_ticket_ids: List[str] = []
+
+
+class BulkCancelRequest(BaseModel):
+    # Leave both unset to cancel every active ticket on the event
+    ticket_type_id: Optional[str] = None
+    ticket_ids: Optional[List[str]] = Field(None, min_length=1, max_length=10000)
+
+
+class ImportRowError(BaseModel):
+    row: int
+    error: str
+
+
+class GuestListImportResponse(BaseModel):
+    imported: int
+    failed: int
+    # First rejected rows only; failed counts all of them
+    errors: List[ImportRowError] = []
+    by_ticket_type: Dict[str, int] = {}
+    # Poll /jobs/{qr_job_id} when QR generation was requested
+    qr_job_id: Optional[str] = None
@@ -20,6 +20,18 @@ class TicketTypeUpdate(BaseModel):
     is_active: Optional[bool] = None
 
 
+class TicketTypeBulkCreate(BaseModel):
+    ticket_types: List[TicketTypeCreate] = Field(..., min_length=1, max_length=100)
+
+
+class TicketTypeBulkUpdateItem(TicketTypeUpdate):
+    id: str
+
+
+class TicketTypeBulkUpdate(BaseModel):
+    ticket_types: List[TicketTypeBulkUpdateItem] = Field(..., min_length=1, max_length=100)
+
+
 class TicketTypeResponse(BaseModel):
     id: str
     event_id: str
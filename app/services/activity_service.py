@@ -0,0 +1,122 @@
+from typing import Dict, Any, List, Optional
+from collections import deque
+from datetime import datetime, timezone
+import threading
+import uuid
+
+from app.core.config import settings
+from app.core.supabase import supabase_admin
+from app.utils.concurrency import run_in_background
+from app.utils.dates import parse_timestamp
+
+
+# Latest activity per organizer, oldest first. Filled from the activity_log
+# tail on first read and kept current by local writes plus tail refreshes,
+# so writers in other services or workers still show up.
+_buffers: Dict[str, deque] = {}
+# Newest activity_log created_at already pulled into each buffer. Local
+# writes do not advance it, so unsynced rows from other writers are not skipped.
+_watermarks: Dict[str, str] = {}
+_lock = threading.Lock()
+
+
+class ActivityService:
+    """Append-only activity log with an in-memory tail per organizer"""
+
+    @staticmethod
+    def _to_activity(row: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "id": row["id"],
+            "event_id": row["event_id"],
+            "event_title": row.get("event_title") or "",
+            "activity_type": row["activity_type"],
+            "description": row["description"],
+            "timestamp": row["created_at"]
+        }
+
+    @staticmethod
+    def _merge(organizer_id: str, entries: List[Dict[str, Any]]) -> None:
+        """Merge entries into the organizer's buffer, keeping only the newest."""
+        with _lock:
+            buffer = _buffers.get(organizer_id)
+            if buffer is None:
+                buffer = deque(maxlen=settings.ACTIVITY_BUFFER_SIZE)
+                _buffers[organizer_id] = buffer
+
+            seen = {a["id"] for a in buffer}
+            fresh = [e for e in entries if e["id"] not in seen]
+            if not fresh:
+                return
+
+            # Entries from other writers can land slightly out of order
+            merged = sorted(
+                list(buffer) + fresh,
+                key=lambda a: parse_timestamp(a["timestamp"])
+            )
+            buffer.clear()
+            buffer.extend(merged)
+
+    @staticmethod
+    def record(
+        organizer_id: str,
+        event_id: str,
+        activity_type: str,
+        description: str,
+        event_title: Optional[str] = None
+    ) -> None:
+        """Append an activity and persist it without blocking the caller."""
+        row = {
+            "id": str(uuid.uuid4()),
+            "organizer_id": organizer_id,
+            "event_id": event_id,
+            "event_title": event_title,
+            "activity_type": activity_type,
+            "description": description,
+            "created_at": datetime.now(timezone.utc).isoformat()
+        }
+        ActivityService._merge(organizer_id, [ActivityService._to_activity(row)])
+
+        def persist():
+            try:
+                supabase_admin.table("activity_log").insert(row).execute()
+            except Exception as e:
+                # The feed is best-effort; never fail the originating write
+                print(f"Activity log write failed: {str(e)}")
+
+        run_in_background(persist)
+
+    @staticmethod
+    def get_recent(organizer_id: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Return the newest activities for an organizer, newest first."""
+        limit = max(0, min(limit, settings.ACTIVITY_BUFFER_SIZE))
+
+        with _lock:
+            watermark = _watermarks.get(organizer_id)
+
+        # Only read the log past what we already hold
+        query = supabase_admin.table("activity_log")\
+            .select("id, event_id, event_title, activity_type, description, created_at")\
+            .eq("organizer_id", organizer_id)
+        if watermark:
+            query = query.gt("created_at", watermark)
+        result = query\
+            .order("created_at", desc=True)\
+            .limit(settings.ACTIVITY_BUFFER_SIZE)\
+            .execute()
+
+        rows = result.data or []
+        ActivityService._merge(
+            organizer_id,
+            [ActivityService._to_activity(r) for r in rows]
+        )
+        if rows:
+            with _lock:
+                _watermarks[organizer_id] = rows[0]["created_at"]
+
+        with _lock:
+            tail = list(_buffers[organizer_id])[-limit:] if limit else []
+
+        return [
+            {k: v for k, v in a.items() if k != "id"}
+            for a in reversed(tail)
+        ]
@@ -0,0 +1,159 @@
+from typing import Dict, Any, List, Optional
+from collections import Counter
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.core.supabase import supabase, supabase_admin
+from app.services.activity_service import ActivityService
+from app.services.job_service import JobService
+from app.services.ticket_type_service import TicketTypeService
+from app.utils.concurrency import run_concurrently, run_job
+
+
+class CancellationService:
+    """Bulk ticket cancellation, run as a pollable background job"""
+
+    @staticmethod
+    def start_bulk_cancel(
+        event_id: str,
+        organizer_id: str,
+        ticket_type_id: Optional[str] = None,
+        ticket_ids: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """Validate the scope, then cancel its active tickets in the background."""
+        if ticket_type_id and ticket_ids:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cancel by ticket type or by ticket IDs, not both"
+            )
+
+        event_query = supabase.table("events")\
+            .select("id, title")\
+            .eq("id", event_id)\
+            .eq("organizer_id", organizer_id)
+        calls = [event_query.execute]
+        if ticket_type_id:
+            calls.append(
+                supabase.table("ticket_types")
+                    .select("name")
+                    .eq("id", ticket_type_id)
+                    .eq("event_id", event_id)
+                    .execute
+            )
+
+        event_result, *rest = run_concurrently(*calls)
+        if not event_result.data:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Event not found or you do not have permission to manage it"
+            )
+        event = event_result.data[0]
+
+        ticket_type_name = None
+        if ticket_type_id:
+            if not rest[0].data:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Ticket type not found"
+                )
+            ticket_type_name = rest[0].data[0]["name"]
+
+        if ticket_ids:
+            ticket_ids = list(dict.fromkeys(ticket_ids))
+            total = len(ticket_ids)
+        else:
+            count_query = supabase_admin.table("tickets")\
+                .select("id", count="exact")\
+                .eq("event_id", event_id)\
+                .eq("status", "active")
+            if ticket_type_name:
+                count_query = count_query.eq("ticket_type_name", ticket_type_name)
+            total = count_query.limit(1).execute().count or 0
+
+        job = JobService.create(
+            organizer_id=organizer_id,
+            event_id=event_id,
+            kind="ticket_cancellation",
+            total=total
+        )
+        run_job(lambda: CancellationService._run(
+            job["id"], event, organizer_id, ticket_type_name, ticket_ids
+        ))
+        return job
+
+    @staticmethod
+    def _cancel_chunk(event_id: str, ticket_ids: List[str]) -> int:
+        """Cancel the still-active tickets among ids and release their type counts."""
+        result = supabase_admin.table("tickets")\
+            .update({"status": "cancelled"})\
+            .in_("id", ticket_ids)\
+            .eq("event_id", event_id)\
+            .eq("status", "active")\
+            .execute()
+
+        cancelled = result.data or []
+        per_type = Counter(t["ticket_type_name"] for t in cancelled if t.get("ticket_type_name"))
+        # Released per chunk so counters stay right even if the job stops midway
+        TicketTypeService.adjust_quantity_sold(
+            event_id, {name: -count for name, count in per_type.items()}
+        )
+        return len(cancelled)
+
+    @staticmethod
+    def _run(
+        job_id: str,
+        event: Dict[str, Any],
+        organizer_id: str,
+        ticket_type_name: Optional[str],
+        ticket_ids: Optional[List[str]]
+    ) -> None:
+        chunk_size = settings.BULK_CANCEL_CHUNK_SIZE
+        processed = 0
+        JobService.update(job_id, status="running")
+
+        try:
+            if ticket_ids:
+                for i in range(0, len(ticket_ids), chunk_size):
+                    processed += CancellationService._cancel_chunk(
+                        event["id"], ticket_ids[i:i + chunk_size]
+                    )
+                    JobService.update(job_id, processed=processed)
+                # Unknown, already used or already cancelled ids
+                skipped = len(ticket_ids) - processed
+            else:
+                skipped = 0
+                while True:
+                    # Cancelled rows drop out of this filter, so each pass
+                    # picks up the next chunk without an offset
+                    query = supabase_admin.table("tickets")\
+                        .select("id")\
+                        .eq("event_id", event["id"])\
+                        .eq("status", "active")
+                    if ticket_type_name:
+                        query = query.eq("ticket_type_name", ticket_type_name)
+                    batch = query.limit(chunk_size).execute().data or []
+                    if not batch:
+                        break
+
+                    cancelled = CancellationService._cancel_chunk(
+                        event["id"], [t["id"] for t in batch]
+                    )
+                    if not cancelled:
+                        raise RuntimeError("Tickets matched but none could be cancelled")
+                    processed += cancelled
+                    JobService.update(job_id, processed=processed)
+
+            JobService.update(job_id, status="completed", processed=processed, failed=skipped)
+
+        except Exception as e:
+            JobService.update(job_id, status="failed", processed=processed, error=str(e))
+
+        if processed:
+            scope = f" ({ticket_type_name})" if ticket_type_name else ""
+            ActivityService.record(
+                organizer_id=organizer_id,
+                event_id=event["id"],
+                event_title=event["title"],
+                activity_type="tickets_cancelled",
+                description=f"{processed} tickets cancelled{scope}"
+            )
@@ -1,9 +1,12 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Callable
 from fastapi import HTTPException, status
-from datetime import datetime
+from datetime import datetime, timezone
 
-from app.core.supabase import supabase
+from app.core.supabase import supabase, supabase_admin
 from app.schemas.event import EventCreate, EventUpdate
+from app.services.activity_service import ActivityService
+from app.utils.concurrency import run_concurrently
+from app.utils.dates import parse_timestamp
 
 
 class EventService:
@@ -129,8 +132,6 @@ class EventService:
                         detail="End date must be after start date"
                     )
             
-            update_dict["updated_at"] = datetime.utcnow().isoformat()
-            
             response = (
                 supabase.table("events")
                 .update(update_dict)
@@ -202,4 +203,136 @@ class EventService:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Not authorized to access this event"
-            )
\ No newline at end of file
+            )
+    
+    @staticmethod
+    def _dashboard_queries(organizer_id: str) -> List[Callable[[], Any]]:
+        """Independent reads shared by all dashboard widgets: events and their totals."""
+        def fetch_events():
+            return (
+                supabase.table("events")
+                .select("id, title, start_date, end_date, ticket_price")
+                .eq("organizer_id", organizer_id)
+                .execute()
+            ).data or []
+        
+        def fetch_totals():
+            # Counted and summed in the database; raw ticket and order rows
+            # would be truncated at max-rows and grow with the whole history
+            return (
+                supabase_admin.rpc(
+                    "organizer_dashboard_totals",
+                    {"p_organizer_id": organizer_id}
+                )
+                .execute()
+            ).data or {}
+        
+        return [fetch_events, fetch_totals]
+    
+    @staticmethod
+    def _fetch_dashboard_data(organizer_id: str) -> Dict[str, Any]:
+        """Fetch the events and per-event totals shared by all dashboard widgets."""
+        try:
+            # The reads are independent, so issue them in parallel
+            events, totals = run_concurrently(
+                *EventService._dashboard_queries(organizer_id)
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Database error: {str(e)}"
+            )
+        
+        return {"events": events, "totals": totals}
+    
+    @staticmethod
+    def get_organizer_stats(
+        organizer_id: str,
+        data: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Compute headline dashboard statistics for an organizer."""
+        if data is None:
+            data = EventService._fetch_dashboard_data(organizer_id)
+        
+        now = datetime.now(timezone.utc)
+        events = data["events"]
+        upcoming_events = 0
+        past_events = 0
+        for event in events:
+            start = parse_timestamp(event.get("start_date"))
+            end = parse_timestamp(event.get("end_date")) or start
+            if start and start > now:
+                upcoming_events += 1
+            elif end and end < now:
+                past_events += 1
+        
+        totals = data["totals"].get("events") or []
+        
+        return {
+            "total_events": len(events),
+            "upcoming_events": upcoming_events,
+            "past_events": past_events,
+            "total_tickets_sold": sum(t["tickets_sold"] for t in totals),
+            "total_revenue": sum(float(t["revenue"] or 0) for t in totals),
+            "active_attendees": data["totals"].get("active_attendees") or 0
+        }
+    
+    @staticmethod
+    def get_revenue_breakdown(
+        organizer_id: str,
+        data: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Break down tickets sold and paid revenue per event."""
+        if data is None:
+            data = EventService._fetch_dashboard_data(organizer_id)
+        
+        breakdown: Dict[str, Dict[str, Any]] = {}
+        for event in data["events"]:
+            breakdown[event["id"]] = {
+                "event_id": event["id"],
+                "event_title": event["title"],
+                "tickets_sold": 0,
+                "revenue": 0.0,
+                "ticket_price": float(event.get("ticket_price") or 0)
+            }
+        
+        for totals in data["totals"].get("events") or []:
+            item = breakdown.get(totals["event_id"])
+            if item:
+                item["tickets_sold"] = totals["tickets_sold"]
+                item["revenue"] = float(totals["revenue"] or 0)
+        
+        return sorted(breakdown.values(), key=lambda item: item["revenue"], reverse=True)
+    
+    @staticmethod
+    def get_recent_activity(organizer_id: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Read the latest activities from the organizer's activity log tail."""
+        try:
+            return ActivityService.get_recent(organizer_id, limit=limit)
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Database error: {str(e)}"
+            )
+    
+    @staticmethod
+    def get_dashboard(organizer_id: str, activity_limit: int = 10) -> Dict[str, Any]:
+        """Build the full dashboard from a single shared fetch."""
+        try:
+            # The activity tail is independent of the shared reads, so it joins the fan-out
+            events, totals, activities = run_concurrently(
+                *EventService._dashboard_queries(organizer_id),
+                lambda: ActivityService.get_recent(organizer_id, limit=activity_limit)
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Database error: {str(e)}"
+            )
+        
+        data = {"events": events, "totals": totals}
+        return {
+            "stats": EventService.get_organizer_stats(organizer_id, data=data),
+            "recent_activities": activities,
+            "revenue_breakdown": EventService.get_revenue_breakdown(organizer_id, data=data)
+        }
\ No newline at end of file
@@ -4,6 +4,24 @@ from datetime import datetime
 
 from app.core.supabase import supabase
 from app.schemas.event import EventCreate, EventUpdate
+from app.schemas.ticket_type import TicketTypeCreate
+from app.services.activity_service import ActivityService
+from app.services.ticket_type_service import TicketTypeService
+from app.utils.etag import compute_etag
+from app.utils.projections import Projection
+
+
+# Columns that change whenever an event's representation changes
+EVENT_VERSION_FIELDS = ("id", "updated_at", "created_at")
+
+# Everything EventResponse renders
+EVENT_PROJECTION = Projection(
+    "id", "title", "description", "location", "start_date", "end_date",
+    "capacity", "ticket_price", "category", "organizer_id",
+    "image_urls", "image_variants", "created_at", "updated_at"
+)
+# Enough to answer "does this event exist and who owns it"
+EVENT_OWNER_PROJECTION = Projection("id", "organizer_id")
 
 
 class EventService:
@@ -39,7 +57,94 @@ class EventService:
                     detail="Failed to create event"
                 )
             
-            return response.data[0]
+            event = response.data[0]
+            ActivityService.record(
+                organizer_id=organizer_id,
+                event_id=event["id"],
+                event_title=event["title"],
+                activity_type="event_created",
+                description=f"Event '{event['title']}' created"
+            )
+            
+            return event
+        
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Database error: {str(e)}"
+            )
+    
+    @staticmethod
+    def validate_event_details(
+        event_data: EventCreate,
+        ticket_types: List[TicketTypeCreate]
+    ) -> None:
+        """Reject bad dates and repeated ticket type names before any work is done."""
+        if event_data.end_date <= event_data.start_date:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="End date must be after start date"
+            )
+        
+        # Duplicate names would otherwise fail the whole transaction
+        seen = set()
+        for ticket_type in ticket_types:
+            key = ticket_type.name.strip().lower()
+            if key in seen:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=f"Ticket type '{ticket_type.name}' is listed more than once"
+                )
+            seen.add(key)
+    
+    @staticmethod
+    def create_event_with_details(
+        event_data: EventCreate,
+        organizer_id: str,
+        image_urls: List[str],
+        ticket_types: List[TicketTypeCreate]
+    ) -> Dict[str, Any]:
+        """Create an event with its images and ticket types in one transactional write."""
+        try:
+            EventService.validate_event_details(event_data, ticket_types)
+            
+            event_dict = event_data.model_dump()
+            event_dict["organizer_id"] = organizer_id
+            event_dict["image_urls"] = image_urls
+            event_dict["created_at"] = datetime.utcnow().isoformat()
+            
+            # create_event_with_ticket_types inserts the event and every ticket
+            # type in a single transaction and returns {event, ticket_types}
+            response = supabase.rpc(
+                "create_event_with_ticket_types",
+                {
+                    "p_event": event_dict,
+                    "p_ticket_types": [t.model_dump() for t in ticket_types]
+                }
+            ).execute()
+            
+            if not response.data:
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail="Failed to create event"
+                )
+            
+            event = response.data["event"]
+            event["ticket_types"] = [
+                TicketTypeService._format(t) for t in (response.data.get("ticket_types") or [])
+            ]
+            
+            ActivityService.record(
+                organizer_id=organizer_id,
+                event_id=event["id"],
+                event_title=event["title"],
+                activity_type="event_created",
+                description=f"Event '{event['title']}' created"
+            )
+            
+            return event
         
         except HTTPException:
             raise
@@ -50,11 +155,14 @@ class EventService:
             )
     
     @staticmethod
-    def get_event_by_id(event_id: str) -> Optional[Dict[str, Any]]:
-        """Retrieve event by ID."""
+    def get_event_by_id(
+        event_id: str,
+        projection: Projection = EVENT_PROJECTION
+    ) -> Optional[Dict[str, Any]]:
+        """Retrieve event by ID, fetching only the projected columns."""
         try:
-            response = supabase.table("events").select("*").eq("id", event_id).execute()
-            return response.data[0] if response.data else None
+            response = supabase.table("events").select(projection.select).eq("id", event_id).execute()
+            return projection.row(response.data[0]) if response.data else None
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -62,9 +170,13 @@ class EventService:
             )
     
     @staticmethod
-    def get_event_by_id_with_auth(event_id: str, user_id: str) -> Dict[str, Any]:
+    def get_event_by_id_with_auth(
+        event_id: str,
+        user_id: str,
+        projection: Projection = EVENT_PROJECTION
+    ) -> Dict[str, Any]:
         """Get event by ID with authorization check."""
-        event = EventService.get_event_by_id(event_id)
+        event = EventService.get_event_by_id(event_id, projection)
         if not event:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -79,18 +191,65 @@ class EventService:
         
         return event
     
+    @staticmethod
+    def get_event_etag(event_id: str, user_id: str) -> str:
+        """Look up an event's ETag without fetching the full row."""
+        try:
+            response = (
+                supabase.table("events")
+                .select("id, organizer_id, updated_at, created_at")
+                .eq("id", event_id)
+                .execute()
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Database error: {str(e)}"
+            )
+        
+        if not response.data:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Event not found"
+            )
+        
+        if response.data[0]["organizer_id"] != user_id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not authorized to access this event"
+            )
+        
+        return compute_etag(response.data, EVENT_VERSION_FIELDS)
+    
+    @staticmethod
+    def get_organizer_events_etag(organizer_id: str) -> str:
+        """Look up the ETag of an organizer's event list from version columns only."""
+        try:
+            response = (
+                supabase.table("events")
+                .select(", ".join(EVENT_VERSION_FIELDS))
+                .eq("organizer_id", organizer_id)
+                .execute()
+            )
+            return compute_etag(response.data or [], EVENT_VERSION_FIELDS)
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Database error: {str(e)}"
+            )
+    
     @staticmethod
     def get_organizer_events(organizer_id: str) -> List[Dict[str, Any]]:
         """Get all events created by a specific organizer."""
         try:
             response = (
                 supabase.table("events")
-                .select("*")
+                .select(EVENT_PROJECTION.select)
                 .eq("organizer_id", organizer_id)
                 .order("created_at", desc=True)
                 .execute()
             )
-            return response.data
+            return EVENT_PROJECTION.rows(response.data)
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -105,20 +264,6 @@ class EventService:
     ) -> Dict[str, Any]:
         """Update an existing event."""
         try:
-            # Check if event exists and belongs to organizer
-            existing_event = EventService.get_event_by_id(event_id)
-            if not existing_event:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Event not found"
-                )
-            
-            if existing_event["organizer_id"] != organizer_id:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="Not authorized to update this event"
-                )
-            
             # Only update fields that were provided
             update_dict = event_data.model_dump(exclude_unset=True)
             
@@ -142,22 +287,28 @@ class EventService:
                         detail="End date must be after start date"
                     )
             
-            update_dict["updated_at"] = datetime.utcnow().isoformat()
-            
+            # Ownership is part of the write; a miss is diagnosed afterwards
             response = (
                 supabase.table("events")
                 .update(update_dict)
                 .eq("id", event_id)
+                .eq("organizer_id", organizer_id)
                 .execute()
             )
             
             if not response.data:
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail="Failed to update event"
-                )
+                EventService._raise_write_failure(event_id, organizer_id, "update")
             
-            return response.data[0]
+            event = response.data[0]
+            ActivityService.record(
+                organizer_id=organizer_id,
+                event_id=event_id,
+                event_title=event["title"],
+                activity_type="event_updated",
+                description=f"Event '{event['title']}' updated"
+            )
+            
+            return event
         
         except HTTPException:
             raise
@@ -171,27 +322,26 @@ class EventService:
     def delete_event(event_id: str, organizer_id: str) -> None:
         """Delete an event."""
         try:
-            # Check if event exists and belongs to organizer
-            existing_event = EventService.get_event_by_id(event_id)
-            if not existing_event:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Event not found"
-                )
-            
-            if existing_event["organizer_id"] != organizer_id:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="Not authorized to delete this event"
-                )
-            
-            response = supabase.table("events").delete().eq("id", event_id).execute()
+            # Ownership is part of the write; a miss is diagnosed afterwards
+            response = (
+                supabase.table("events")
+                .delete()
+                .eq("id", event_id)
+                .eq("organizer_id", organizer_id)
+                .execute()
+            )
             
             if not response.data:
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail="Failed to delete event"
-                )
+                EventService._raise_write_failure(event_id, organizer_id, "delete")
+            
+            deleted_event = response.data[0]
+            ActivityService.record(
+                organizer_id=organizer_id,
+                event_id=event_id,
+                event_title=deleted_event["title"],
+                activity_type="event_deleted",
+                description=f"Event '{deleted_event['title']}' deleted"
+            )
         
         except HTTPException:
             raise
@@ -204,7 +354,7 @@ class EventService:
     @staticmethod
     def verify_event_ownership(event_id: str, organizer_id: str) -> None:
         """Verify that an organizer owns an event."""
-        event = EventService.get_event_by_id(event_id)
+        event = EventService.get_event_by_id(event_id, EVENT_OWNER_PROJECTION)
         if not event:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -218,26 +368,22 @@ class EventService:
             )
     
     @staticmethod
-    def update_event_images(event_id: str, image_urls: List[str]) -> Dict[str, Any]:
-        """Update event with image URLs after upload."""
-        try:
-            response = (
-                supabase.table("events")
-                .update({"image_urls": image_urls})
-                .eq("id", event_id)
-                .execute()
+    def _raise_write_failure(event_id: str, organizer_id: str, action: str) -> None:
+        """Explain why an ownership-filtered write matched no rows."""
+        event = EventService.get_event_by_id(event_id, EVENT_OWNER_PROJECTION)
+        if not event:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Event not found"
             )
-            
-            if not response.data:
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail="Failed to update event images"
-                )
-            
-            return response.data[0]
         
-        except Exception as e:
+        if event["organizer_id"] != organizer_id:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to update images: {str(e)}"
-            )
\ No newline at end of file
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Not authorized to {action} this event"
+            )
+        
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to {action} event"
+        )
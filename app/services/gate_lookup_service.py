@@ -0,0 +1,253 @@
+from typing import Dict, Any, List, Optional, Tuple
+from bisect import bisect_left, insort
+from datetime import datetime, timedelta, timezone
+from fastapi import HTTPException, status
+import threading
+import time
+
+from app.core.config import settings
+from app.core.supabase import supabase, supabase_admin
+from app.utils.concurrency import run_concurrently, run_in_background
+from app.utils.projections import Projection
+
+
+GATE_TICKET_PROJECTION = Projection(
+    "id", "status", "ticket_type_name", "checked_in_at", "created_at", "updated_at",
+    "customer_email",
+    embeds={"orders": Projection("reference")}
+)
+
+# How far before the build the first refresh starts looking for changes.
+# The paged build is not one snapshot, and app and database clocks differ;
+# a generous margin covers both at the cost of re-reading a few rows once.
+GATE_INDEX_SEED_MARGIN = timedelta(hours=1)
+
+# Tickets per keyset page when building an index. Kept at or under PostgREST
+# max-rows; paging stops on an empty page, so a lower cap only costs requests.
+GATE_INDEX_PAGE_SIZE = 1000
+
+
+class _EventIndex:
+    """Prefix terms for one event's tickets, kept sorted for bisect lookups.
+
+    Emails and order references are indexed as-is; ticket ids are indexed
+    reversed so "last few characters" becomes a prefix search too.
+    """
+
+    def __init__(self, event_id: str, organizer_id: str):
+        self.event_id = event_id
+        self.organizer_id = organizer_id
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.terms: List[Tuple[str, str]] = []
+        self.id_terms: List[Tuple[str, str]] = []
+        # Newest tickets.updated_at pulled in, seeded when the index is built;
+        # local check-ins do not advance it
+        self.watermark: Optional[str] = None
+        self.refreshed_at = 0.0
+        self.refreshing = False
+        self.last_used = time.monotonic()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def _to_entry(row: Dict[str, Any]) -> Dict[str, Any]:
+        order = row.get("orders") or {}
+        return {
+            "ticket_id": row["id"],
+            "attendee_name": row.get("customer_email", "Unknown"),
+            "attendee_email": row.get("customer_email"),
+            "order_reference": order.get("reference"),
+            "ticket_type": row.get("ticket_type_name"),
+            "status": row["status"],
+            "checked_in_at": row.get("checked_in_at"),
+            "purchased_at": row["created_at"]
+        }
+
+    @staticmethod
+    def _terms_for(entry: Dict[str, Any]) -> List[str]:
+        return [
+            term.lower() for term in (entry["attendee_email"], entry["order_reference"])
+            if term
+        ]
+
+    def build(self, rows: List[Dict[str, Any]]) -> None:
+        """Index a full ticket snapshot, sorting the terms once rather than per row."""
+        for row in rows:
+            entry = self._to_entry(row)
+            ticket_id = entry["ticket_id"]
+            self.entries[ticket_id] = entry
+            self.terms.extend((term, ticket_id) for term in self._terms_for(entry))
+            self.id_terms.append((ticket_id.lower()[::-1], ticket_id))
+            if row.get("updated_at") and (self.watermark is None or row["updated_at"] > self.watermark):
+                self.watermark = row["updated_at"]
+        self.terms.sort()
+        self.id_terms.sort()
+
+    def upsert(self, row: Dict[str, Any]) -> None:
+        """Index a changed ticket row, replacing any terms from an older version. Caller holds lock."""
+        entry = self._to_entry(row)
+        ticket_id = entry["ticket_id"]
+
+        previous = self.entries.get(ticket_id)
+        if previous is not None:
+            for term in self._terms_for(previous):
+                i = bisect_left(self.terms, (term, ticket_id))
+                if i < len(self.terms) and self.terms[i] == (term, ticket_id):
+                    del self.terms[i]
+        else:
+            insort(self.id_terms, (ticket_id.lower()[::-1], ticket_id))
+
+        for term in self._terms_for(entry):
+            insort(self.terms, (term, ticket_id))
+        self.entries[ticket_id] = entry
+
+        if row.get("updated_at") and (self.watermark is None or row["updated_at"] > self.watermark):
+            self.watermark = row["updated_at"]
+
+    @staticmethod
+    def _scan(terms: List[Tuple[str, str]], prefix: str, found: Dict[str, None], limit: int) -> None:
+        i = bisect_left(terms, (prefix, ""))
+        while i < len(terms) and len(found) < limit and terms[i][0].startswith(prefix):
+            found.setdefault(terms[i][1])
+            i += 1
+
+    def search(self, query: str, limit: int) -> List[Dict[str, Any]]:
+        query = query.strip().lower()
+        found: Dict[str, None] = {}
+        with self.lock:
+            self._scan(self.terms, query, found, limit)
+            self._scan(self.id_terms, query[::-1], found, limit)
+            return [dict(self.entries[ticket_id]) for ticket_id in found]
+
+
+# One index per event being scanned, shared by every request in this worker
+_indexes: Dict[str, _EventIndex] = {}
+_lock = threading.Lock()
+
+
+class GateLookupService:
+    """In-memory prefix search over an event's tickets for manual gate lookup"""
+
+    @staticmethod
+    def _evict_idle() -> None:
+        cutoff = time.monotonic() - settings.GATE_INDEX_IDLE_SECONDS
+        with _lock:
+            for event_id in [e for e, idx in _indexes.items() if idx.last_used < cutoff]:
+                del _indexes[event_id]
+
+    @staticmethod
+    def _tickets_page(event_id: str, after_id: Optional[str]):
+        query = supabase_admin.table("tickets")\
+            .select(GATE_TICKET_PROJECTION.select)\
+            .eq("event_id", event_id)
+        if after_id:
+            query = query.gt("id", after_id)
+        return query.order("id").limit(GATE_INDEX_PAGE_SIZE)
+
+    @staticmethod
+    def start_session(event_id: str, organizer_id: str) -> Dict[str, Any]:
+        """Build (or rebuild) the event's index, paging through its tickets by id."""
+        event_query = supabase.table("events")\
+            .select("id")\
+            .eq("id", event_id)\
+            .eq("organizer_id", organizer_id)
+
+        started = datetime.now(timezone.utc)
+
+        # The ownership check rides along with the first page
+        event_result, page = run_concurrently(
+            event_query.execute,
+            GateLookupService._tickets_page(event_id, None).execute
+        )
+        if not event_result.data:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Event not found or you do not have permission to access it"
+            )
+
+        # A single read is truncated at max-rows; keyset pages are not
+        rows: List[Dict[str, Any]] = []
+        while page.data:
+            rows.extend(GATE_TICKET_PROJECTION.rows(page.data))
+            page = GateLookupService._tickets_page(event_id, page.data[-1]["id"]).execute()
+
+        index = _EventIndex(event_id, organizer_id)
+        index.build(rows)
+        # Pages are read at different moments, so a ticket changed mid-build
+        # can be older than the newest row seen; start refreshes from before
+        # the build instead. Also keeps refreshes filtered for empty events.
+        seed = (started - GATE_INDEX_SEED_MARGIN).isoformat()
+        index.watermark = min(index.watermark, seed) if index.watermark else seed
+        index.refreshed_at = time.monotonic()
+
+        GateLookupService._evict_idle()
+        with _lock:
+            _indexes[event_id] = index
+
+        return {"event_id": event_id, "indexed": len(index.entries)}
+
+    @staticmethod
+    def _refresh(index: _EventIndex) -> None:
+        """Pull tickets sold, cancelled or checked in elsewhere since the watermark."""
+        try:
+            # gte so writes sharing the watermark's timestamp are not missed;
+            # oldest first, so a delta cut off at max-rows resumes next time
+            result = supabase_admin.table("tickets")\
+                .select(GATE_TICKET_PROJECTION.select)\
+                .eq("event_id", index.event_id)\
+                .gte("updated_at", index.watermark)\
+                .order("updated_at")\
+                .execute()
+
+            with index.lock:
+                for row in GATE_TICKET_PROJECTION.rows(result.data):
+                    index.upsert(row)
+                index.refreshed_at = time.monotonic()
+        except Exception as e:
+            # A stale index is still useful at the gate; try again next lookup
+            print(f"Gate index refresh failed for {index.event_id}: {str(e)}")
+        finally:
+            index.refreshing = False
+
+    @staticmethod
+    def lookup(event_id: str, organizer_id: str, query: str, limit: int = 10) -> Dict[str, Any]:
+        """Match tickets by email or order reference prefix, or ticket id suffix."""
+        with _lock:
+            index = _indexes.get(event_id)
+        if index is None:
+            GateLookupService.start_session(event_id, organizer_id)
+            with _lock:
+                index = _indexes[event_id]
+
+        if index.organizer_id != organizer_id:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Event not found or you do not have permission to access it"
+            )
+
+        index.last_used = time.monotonic()
+
+        # Never block a keystroke on the database; catch up in the background
+        with index.lock:
+            stale = time.monotonic() - index.refreshed_at > settings.GATE_INDEX_REFRESH_SECONDS
+            refresh = stale and not index.refreshing
+            if refresh:
+                index.refreshing = True
+        if refresh:
+            run_in_background(lambda: GateLookupService._refresh(index))
+
+        results = index.search(query, limit)
+        return {"results": results, "total": len(results)}
+
+    @staticmethod
+    def apply_check_in(event_id: str, ticket_id: str, checked_in_at: str) -> None:
+        """Reflect a local check-in immediately in the event's index, if one is live."""
+        with _lock:
+            index = _indexes.get(event_id)
+        if index is None:
+            return
+
+        with index.lock:
+            entry = index.entries.get(ticket_id)
+            if entry is not None:
+                entry["status"] = "used"
+                entry["checked_in_at"] = checked_in_at
@@ -1,31 +1,492 @@
+import asyncio
+import hashlib
+import multiprocessing
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import PurePosixPath
+from typing import Any, Dict, List, Optional
+
+import httpx
+from fastapi import UploadFile, HTTPException, status
+
+from app.core.config import settings
 from app.core.supabase import supabase
-from fastapi import UploadFile
+from app.utils.images import render_variants, VARIANT_SIZES, VARIANT_FORMATS
+
+
+# Raw Storage REST client so request bodies can be streamed; the storage3
+# helper only accepts fully buffered bytes or a path on disk.
+_storage_client = httpx.AsyncClient(
+    base_url=f"{settings.SUPABASE_URL}/storage/v1",
+    headers={
+        "Authorization": f"Bearer {settings.SUPABASE_SERVICE_ROLE_KEY}",
+        "apikey": settings.SUPABASE_SERVICE_ROLE_KEY
+    },
+    timeout=httpx.Timeout(60.0, connect=10.0)
+)
+
+_IMAGE_SIGNATURES = {
+    b"\xff\xd8\xff": "image/jpeg",
+    b"\x89PNG\r\n\x1a\n": "image/png",
+    b"GIF87a": "image/gif",
+    b"GIF89a": "image/gif",
+}
+
+_EXTENSIONS = {
+    "image/jpeg": "jpg",
+    "image/png": "png",
+    "image/gif": "gif",
+    "image/webp": "webp",
+}
+
+
+def _sniff_content_type(head: bytes) -> Optional[str]:
+    """Identify the image type from its leading bytes."""
+    for signature, content_type in _IMAGE_SIGNATURES.items():
+        if head.startswith(signature):
+            return content_type
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
+# Created on first use so importing this module never spawns processes
+_process_pool: Optional[ProcessPoolExecutor] = None
+# Background variant jobs; held so they are not garbage collected mid-run
+_variant_tasks: set = set()
+
 
-async def upload_event_image(file: UploadFile, event_id: str) -> str:
-    contents = await file.read()
-    path = f"events/{event_id}/{file.filename}"
-    
-    supabase.storage.from_("event-images").upload(
-        path,
-        contents,
-        file_options={"content-type": file.content_type}
+def _get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    if _process_pool is None:
+        # spawn, not fork: the parent already runs I/O threads
+        _process_pool = ProcessPoolExecutor(
+            max_workers=settings.IMAGE_PROCESS_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _process_pool
+
+
+def _too_large(filename: str) -> HTTPException:
+    limit_mb = settings.MAX_IMAGE_SIZE_BYTES // (1024 * 1024)
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"{filename} exceeds the {limit_mb}MB image limit"
+    )
+
+
+async def store_image(file: UploadFile, organizer_id: str) -> Dict[str, Any]:
+    """Store an image in the organizer's content-addressed space.
+
+    Has no event side effects, so it can run before the event exists.
+    """
+    # The multipart parser already knows the spooled size; reject before reading
+    if file.size is not None and file.size > settings.MAX_IMAGE_SIZE_BYTES:
+        raise _too_large(file.filename)
+
+    head = await file.read(settings.IMAGE_UPLOAD_CHUNK_BYTES)
+    content_type = _sniff_content_type(head)
+    if content_type is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"{file.filename} is not a JPEG, PNG, GIF or WebP image"
+        )
+
+    # Hash the local spool chunk by chunk; only new content goes over the network
+    digest = hashlib.sha256(head)
+    size = len(head)
+    while chunk := await file.read(settings.IMAGE_UPLOAD_CHUNK_BYTES):
+        size += len(chunk)
+        # Size was unknown up front; stop as soon as it overflows
+        if size > settings.MAX_IMAGE_SIZE_BYTES:
+            raise _too_large(file.filename)
+        digest.update(chunk)
+    content_hash = digest.hexdigest()
+
+    existing = await asyncio.to_thread(
+        supabase.table("image_hashes")
+        .select("url, variants")
+        .eq("organizer_id", organizer_id)
+        .eq("content_hash", content_hash)
+        .execute
     )
-    
-    return supabase.storage.from_("event-images").get_public_url(path)
+    if existing.data:
+        known = existing.data[0]
+        return {
+            "url": known["url"],
+            "path": None,
+            "content_hash": content_hash,
+            "variants": known.get("variants")
+        }
+
+    await file.seek(0)
+
+    async def chunks():
+        while chunk := await file.read(settings.IMAGE_UPLOAD_CHUNK_BYTES):
+            yield chunk
+
+    bucket = settings.STORAGE_BUCKET_NAME
+    path = f"organizers/{organizer_id}/{content_hash}.{_EXTENSIONS[content_type]}"
+
+    response = await _storage_client.post(
+        f"/object/{bucket}/{path}",
+        content=chunks(),
+        headers={"content-type": content_type, "x-upsert": "false"}
+    )
+    # Same path means same bytes, so an existing object is a success
+    if response.is_error and "Duplicate" not in response.text:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"Storage upload failed for {file.filename}: {response.text}"
+        )
+
+    url = supabase.storage.from_(bucket).get_public_url(path)
+    await asyncio.to_thread(
+        supabase.table("image_hashes").upsert(
+            {
+                "organizer_id": organizer_id,
+                "content_hash": content_hash,
+                "path": path,
+                "url": url
+            },
+            on_conflict="organizer_id,content_hash",
+            ignore_duplicates=True
+        ).execute
+    )
+
+    return {"url": url, "path": path, "content_hash": content_hash, "variants": None}
+
+
+def attach_stored_image(event_id: str, organizer_id: str, stored: Dict[str, Any]) -> None:
+    """Give an event the variants of a stored image, rendering them if new."""
+    if stored["variants"]:
+        task = asyncio.create_task(
+            _record_event_variants(event_id, stored["url"], stored["variants"])
+        )
+        _variant_tasks.add(task)
+        task.add_done_callback(_variant_tasks.discard)
+    elif stored["path"]:
+        _schedule_variants(
+            event_id, organizer_id, stored["content_hash"], stored["path"], stored["url"]
+        )
+
+
+async def upload_event_image(file: UploadFile, event_id: str, organizer_id: str) -> str:
+    stored = await store_image(file, organizer_id)
+    attach_stored_image(event_id, organizer_id, stored)
+    return stored["url"]
+
+
+def _schedule_variants(
+    event_id: str,
+    organizer_id: str,
+    content_hash: Optional[str],
+    path: str,
+    url: str
+) -> None:
+    """Render derivatives for an uploaded image without holding the request."""
+    task = asyncio.create_task(
+        _generate_variants(event_id, organizer_id, content_hash, path, url)
+    )
+    _variant_tasks.add(task)
+    task.add_done_callback(_variant_tasks.discard)
+
+
+async def _record_event_variants(
+    event_id: str,
+    url: str,
+    variant_urls: Dict[str, Any]
+) -> None:
+    try:
+        # Merged server-side so concurrent jobs on any worker keep each
+        # other's entries; an event deleted meanwhile just matches no row
+        await asyncio.to_thread(
+            supabase.rpc(
+                "merge_event_image_variants",
+                {"p_event_id": event_id, "p_url": url, "p_variants": variant_urls}
+            ).execute
+        )
+    except Exception as e:
+        # Runs as a background task; the event still has its original image
+        print(f"Recording image variants failed for event {event_id}: {str(e)}")
+
+
+async def _generate_variants(
+    event_id: str,
+    organizer_id: str,
+    content_hash: Optional[str],
+    path: str,
+    url: str
+) -> None:
+    bucket = settings.STORAGE_BUCKET_NAME
+    try:
+        # Re-read the stored original rather than keeping request bytes alive
+        original = await _storage_client.get(f"/object/{bucket}/{path}")
+        original.raise_for_status()
+
+        loop = asyncio.get_running_loop()
+        rendered = await loop.run_in_executor(
+            _get_process_pool(), render_variants, original.content
+        )
+
+        source = PurePosixPath(path)
+        variant_urls: Dict[str, Dict[str, str]] = {}
+        for name, formats in rendered.items():
+            variant_urls[name] = {}
+            for extension, (content_type, data) in formats.items():
+                variant_path = f"{source.parent}/variants/{source.stem}/{name}.{extension}"
+                response = await _storage_client.post(
+                    f"/object/{bucket}/{variant_path}",
+                    content=data,
+                    headers={"content-type": content_type, "x-upsert": "true"}
+                )
+                response.raise_for_status()
+                variant_urls[name][extension] = (
+                    supabase.storage.from_(bucket).get_public_url(variant_path)
+                )
 
+        await _record_event_variants(event_id, url, variant_urls)
+
+        # Later uploads of the same content reuse these without re-rendering
+        if content_hash:
+            await asyncio.to_thread(
+                supabase.table("image_hashes")
+                .update({"variants": variant_urls})
+                .eq("organizer_id", organizer_id)
+                .eq("content_hash", content_hash)
+                .execute
+            )
+    except Exception as e:
+        # Originals are already stored; variants are an optimization
+        print(f"Image variant generation failed for {path}: {str(e)}")
+
+
+async def store_images(files: list[UploadFile], organizer_id: str) -> dict:
+    """Store many images concurrently, reporting failures per file."""
+    semaphore = asyncio.Semaphore(settings.IMAGE_UPLOAD_CONCURRENCY)
+
+    async def store_one(file: UploadFile) -> Dict[str, Any]:
+        async with semaphore:
+            return await store_image(file, organizer_id)
+
+    # One failed file must not discard the others
+    results = await asyncio.gather(
+        *(store_one(file) for file in files),
+        return_exceptions=True
+    )
+
+    stored = []
+    failed = []
+    for file, result in zip(files, results):
+        if isinstance(result, Exception):
+            failed.append({
+                "filename": file.filename,
+                "error": getattr(result, "detail", None) or str(result)
+            })
+        elif all(item["url"] != result["url"] for item in stored):
+            stored.append(result)
+
+    return {"stored": stored, "failed": failed}
+
+
+async def upload_event_images(
+    event_id: str,
+    files: list[UploadFile],
+    organizer_id: str
+) -> dict:
+    result = await store_images(files, organizer_id)
+
+    # Doubles as the ownership check; nothing touches the event before it
+    all_urls = await _append_event_image_urls(
+        event_id, organizer_id, [stored["url"] for stored in result["stored"]]
+    )
+    for stored in result["stored"]:
+        attach_stored_image(event_id, organizer_id, stored)
+
+    return {"image_urls": all_urls, "failed": result["failed"]}
+
+
+async def _append_event_image_urls(
+    event_id: str,
+    organizer_id: str,
+    image_urls: List[str]
+) -> List[str]:
+    """Add new URLs to the organizer's event and return the full list."""
+    # Server-side append skips URLs already present and cannot lose
+    # concurrent appends the way a read-modify-write would; it also bumps
+    # updated_at so cached ETags for the event are invalidated. Returns null
+    # when the event is missing or not owned, so it is the ownership check too.
+    result = await asyncio.to_thread(
+        supabase.rpc(
+            "append_event_image_urls",
+            {"p_event_id": event_id, "p_organizer_id": organizer_id, "p_urls": image_urls}
+        ).execute
+    )
+    if result.data is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Event not found or you do not have permission to access it"
+        )
+    return result.data
+
+
+def _storage_path(url: str) -> Optional[str]:
+    """Map a public object URL back to its path inside the bucket."""
+    prefix = f"{settings.SUPABASE_URL}/storage/v1/object/public/{settings.STORAGE_BUCKET_NAME}/"
+    url = url.split("?", 1)[0]
+    return url[len(prefix):] if url.startswith(prefix) else None
+
+
+def _variant_paths(path: str) -> List[str]:
+    source = PurePosixPath(path)
+    return [
+        f"{source.parent}/variants/{source.stem}/{name}.{extension}"
+        for name in VARIANT_SIZES
+        for _, extension, _, _ in VARIANT_FORMATS
+    ]
+
+
+async def delete_event_images(event_id: str, organizer_id: str, image_urls: List[str]) -> dict:
+    """Detach images from an event and delete objects no other event still uses."""
+    # Removes the URLs and their variants from the event in one statement;
+    # returns null when the event is missing or not owned by the organizer
+    result = await asyncio.to_thread(
+        supabase.rpc(
+            "remove_event_image_urls",
+            {"p_event_id": event_id, "p_organizer_id": organizer_id, "p_urls": image_urls}
+        ).execute
+    )
+    if not result.data:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Event not found or you do not have permission to access it"
+        )
+
+    removed = result.data.get("removed") or []
+    if removed:
+        # Deduplicated images can be shared by several of the organizer's events
+        still_used = await asyncio.to_thread(
+            supabase.table("events")
+            .select("image_urls")
+            .eq("organizer_id", organizer_id)
+            .ov("image_urls", removed)
+            .execute
+        )
+        in_use = {url for e in (still_used.data or []) for url in (e.get("image_urls") or [])}
+        orphaned = [url for url in removed if url not in in_use]
+
+        paths = []
+        for url in orphaned:
+            path = _storage_path(url)
+            if path:
+                paths.append(path)
+                paths.extend(_variant_paths(path))
+
+        if paths:
+            bucket = settings.STORAGE_BUCKET_NAME
+            # One storage call removes every object
+            response = await _storage_client.request(
+                "DELETE", f"/object/{bucket}", json={"prefixes": paths}
+            )
+            if response.is_error:
+                # Hash rows stay, so re-uploads keep pointing at the surviving objects
+                raise HTTPException(
+                    status_code=status.HTTP_502_BAD_GATEWAY,
+                    detail=f"Images were removed from the event but storage cleanup failed: {response.text}"
+                )
+            # Only drop the hash index once its objects are really gone
+            await asyncio.to_thread(
+                supabase.table("image_hashes")
+                .delete()
+                .eq("organizer_id", organizer_id)
+                .in_("url", orphaned)
+                .execute
+            )
+
+    return {"deleted_count": len(removed), "image_urls": result.data.get("image_urls") or []}
+
+
+async def create_signed_uploads(event_id: str, files: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    """Issue signed URLs so the browser can upload image bytes straight to storage."""
+    bucket = settings.STORAGE_BUCKET_NAME
+
+    async def sign(file: Dict[str, str]) -> Dict[str, str]:
+        extension = _EXTENSIONS.get(file["content_type"])
+        if extension is None:
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                detail=f"{file['filename']} is not a JPEG, PNG, GIF or WebP image"
+            )
+
+        # Random names under the event prefix; confirm only accepts this prefix
+        path = f"events/{event_id}/{uuid.uuid4().hex}.{extension}"
+        response = await _storage_client.post(f"/object/upload/sign/{bucket}/{path}")
+        if response.is_error:
+            raise HTTPException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                detail=f"Could not sign upload for {file['filename']}: {response.text}"
+            )
+
+        signed_url = f"{settings.SUPABASE_URL}/storage/v1{response.json()['url']}"
+        return {
+            "filename": file["filename"],
+            "path": path,
+            "signed_url": signed_url,
+            "token": httpx.URL(signed_url).params.get("token")
+        }
+
+    return list(await asyncio.gather(*(sign(file) for file in files)))
+
+
+async def confirm_signed_uploads(event_id: str, organizer_id: str, paths: List[str]) -> dict:
+    """Record finished direct uploads on the event after checking what landed."""
+    bucket = settings.STORAGE_BUCKET_NAME
+    prefix = f"events/{event_id}/"
+
+    # One listing call covers every confirmed path
+    listing = await _storage_client.post(
+        f"/object/list/{bucket}",
+        json={"prefix": prefix, "limit": 1000, "offset": 0}
+    )
+    if listing.is_error:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"Could not list uploaded images: {listing.text}"
+        )
+    stored = {f"{prefix}{o['name']}": (o.get("metadata") or {}) for o in listing.json()}
 
-async def upload_event_images(event_id: str, files: list[UploadFile]) -> list[str]:
     image_urls = []
-    for file in files:
-        url = await upload_event_image(file, event_id)
-        image_urls.append(url)
+    accepted = []
+    failed = []
+    rejected = []
+    for path in dict.fromkeys(paths):
+        if not path.startswith(prefix) or path not in stored:
+            failed.append({"filename": path, "error": "Upload not found for this event"})
+            continue
+
+        metadata = stored[path]
+        if (metadata.get("size") or 0) > settings.MAX_IMAGE_SIZE_BYTES:
+            failed.append({"filename": path, "error": _too_large(path).detail})
+            rejected.append(path)
+            continue
+        if metadata.get("mimetype") not in _EXTENSIONS:
+            failed.append({"filename": path, "error": "Uploaded file is not a supported image type"})
+            rejected.append(path)
+            continue
+
+        image_urls.append(supabase.storage.from_(bucket).get_public_url(path))
+        accepted.append(path)
+
+    # Ownership is settled here, before any object is deleted or rendered
+    all_urls = await _append_event_image_urls(event_id, organizer_id, image_urls)
 
-    # Fetch existing URLs so we don't overwrite previous uploads
-    result = supabase.table("events").select("image_urls").eq("id", event_id).single().execute()
-    existing_urls = result.data.get("image_urls") or []
+    for path, url in zip(accepted, image_urls):
+        _schedule_variants(event_id, organizer_id, None, path, url)
 
-    # Merge and save back to the database
-    all_urls = existing_urls + image_urls
-    supabase.table("events").update({"image_urls": all_urls}).eq("id", event_id).execute()
+    if rejected:
+        # Do not keep objects that broke the upload rules
+        await _storage_client.request(
+            "DELETE", f"/object/{bucket}", json={"prefixes": rejected}
+        )
 
-    return all_urls
\ No newline at end of file
+    return {"image_urls": all_urls, "failed": failed}
@@ -0,0 +1,248 @@
+from typing import Dict, Any, List, BinaryIO, Iterator, Optional, Tuple
+from collections import Counter
+from contextlib import closing
+from fastapi import HTTPException, status
+from pydantic import EmailStr, TypeAdapter, ValidationError
+from postgrest.types import ReturnMethod
+import csv
+import io
+import uuid
+
+from app.core.config import settings
+from app.core.supabase import supabase, supabase_admin
+from app.services.activity_service import ActivityService
+from app.services.job_service import JobService
+from app.services.ticket_type_service import TicketTypeService
+from app.utils.concurrency import run_concurrently, run_job
+from app.utils.qr import render_ticket_qr
+
+
+IMPORT_REQUIRED_COLUMNS = ("email", "ticket_type")
+# Row errors echoed back; the failed count still covers every bad row
+MAX_REPORTED_ERRORS = 100
+
+_email_adapter = TypeAdapter(EmailStr)
+
+
+class ImportService:
+    """Comp and guest-list ticket imports from CSV"""
+
+    @staticmethod
+    def _qr_path(event_id: str, ticket_id: str) -> str:
+        return f"qr/{event_id}/{ticket_id}.png"
+
+    @staticmethod
+    def _read_rows(
+        file: BinaryIO,
+        ticket_types: Dict[str, str]
+    ) -> Iterator[Tuple[int, Optional[str], Optional[str], Optional[str]]]:
+        """Yield (line, email, ticket type name, error) for each CSV data row."""
+        text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+        try:
+            reader = csv.DictReader(text)
+            if reader.fieldnames is None:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="The CSV file is empty"
+                )
+            reader.fieldnames = [(f or "").strip().lower() for f in reader.fieldnames]
+            missing = [c for c in IMPORT_REQUIRED_COLUMNS if c not in reader.fieldnames]
+            if missing:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"CSV is missing required columns: {', '.join(missing)}"
+                )
+
+            # Line 1 is the header
+            for line, row in enumerate(reader, start=2):
+                email = (row.get("email") or "").strip()
+                type_name = ticket_types.get((row.get("ticket_type") or "").strip().lower())
+
+                error = None
+                if not email:
+                    error = "Missing email"
+                elif type_name is None:
+                    error = f"Unknown ticket type '{row.get('ticket_type') or ''}'"
+                else:
+                    try:
+                        email = _email_adapter.validate_python(email)
+                    except ValidationError:
+                        error = f"Invalid email '{email}'"
+
+                yield line, email, type_name, error
+        finally:
+            # Leave the upload's file open for its owner to close
+            text.detach()
+
+    @staticmethod
+    def import_guest_list(
+        event_id: str,
+        organizer_id: str,
+        file: BinaryIO,
+        generate_qr: bool = False
+    ) -> Dict[str, Any]:
+        """Stream a CSV of email,ticket_type rows into batched ticket inserts.
+
+        The file is read twice and only one batch is held in memory. The
+        first pass validates every row, enforces the row cap and reserves
+        quantity_sold for all valid rows at once, so nothing is written when
+        the file is too long or a ticket type would be oversold. The second
+        pass inserts; if it stops early, the unused reservation is released.
+        """
+        event_query = supabase.table("events")\
+            .select("id, title")\
+            .eq("id", event_id)\
+            .eq("organizer_id", organizer_id)
+        tt_query = supabase.table("ticket_types")\
+            .select("name")\
+            .eq("event_id", event_id)
+
+        event_result, tt_result = run_concurrently(event_query.execute, tt_query.execute)
+        if not event_result.data:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Event not found or you do not have permission to manage it"
+            )
+        event = event_result.data[0]
+        ticket_types = {tt["name"].lower(): tt["name"] for tt in (tt_result.data or [])}
+
+        # Pass 1: validate and count, writing nothing
+        requested: Counter = Counter()
+        errors: List[Dict[str, Any]] = []
+        failed = 0
+        try:
+            with closing(ImportService._read_rows(file, ticket_types)) as rows:
+                for line, _, type_name, error in rows:
+                    if line - 1 > settings.IMPORT_MAX_ROWS:
+                        raise HTTPException(
+                            status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=f"Imports are limited to {settings.IMPORT_MAX_ROWS} rows; nothing was imported"
+                        )
+                    if error:
+                        failed += 1
+                        if len(errors) < MAX_REPORTED_ERRORS:
+                            errors.append({"row": line, "error": error})
+                    else:
+                        requested[type_name] += 1
+        except (csv.Error, UnicodeDecodeError) as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Could not read CSV: {str(e)}"
+            )
+
+        # Comps count against the same inventory as sales; 409 if any type
+        # lacks room, before a single ticket exists
+        TicketTypeService.reserve_quantities(event_id, dict(requested))
+
+        # Pass 2: insert the valid rows
+        bucket = supabase_admin.storage.from_(settings.STORAGE_BUCKET_NAME)
+        batch: List[Dict[str, Any]] = []
+        per_type: Counter = Counter()
+        qr_ticket_ids: List[str] = []
+
+        def flush() -> None:
+            supabase_admin.table("tickets")\
+                .insert(batch, returning=ReturnMethod.minimal)\
+                .execute()
+            per_type.update(t["ticket_type_name"] for t in batch)
+            if generate_qr:
+                qr_ticket_ids.extend(t["id"] for t in batch)
+            batch.clear()
+
+        try:
+            file.seek(0)
+            with closing(ImportService._read_rows(file, ticket_types)) as rows:
+                for _, email, type_name, error in rows:
+                    if error:
+                        continue
+
+                    ticket_id = str(uuid.uuid4())
+                    batch.append({
+                        "id": ticket_id,
+                        "event_id": event_id,
+                        "customer_email": email,
+                        "ticket_type_name": type_name,
+                        "status": "active",
+                        # Known up front; the QR job uploads the image to this path
+                        "qr_code_url": (
+                            bucket.get_public_url(ImportService._qr_path(event_id, ticket_id))
+                            if generate_qr else None
+                        )
+                    })
+                    if len(batch) >= settings.IMPORT_BATCH_SIZE:
+                        flush()
+
+            if batch:
+                flush()
+
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Import failed after {sum(per_type.values())} imported tickets: {str(e)}"
+            )
+        finally:
+            # Hand back whatever was reserved but never inserted
+            TicketTypeService.adjust_quantity_sold(
+                event_id, {name: per_type[name] - count for name, count in requested.items()}
+            )
+
+        imported = sum(per_type.values())
+        if imported:
+            ActivityService.record(
+                organizer_id=organizer_id,
+                event_id=event_id,
+                event_title=event["title"],
+                activity_type="tickets_imported",
+                description=f"{imported} guest-list tickets imported"
+            )
+
+        qr_job_id = None
+        if qr_ticket_ids:
+            job = JobService.create(
+                organizer_id=organizer_id,
+                event_id=event_id,
+                kind="qr_generation",
+                total=len(qr_ticket_ids)
+            )
+            qr_job_id = job["id"]
+            run_job(lambda: ImportService._generate_qr_codes(qr_job_id, event_id, qr_ticket_ids))
+
+        return {
+            "imported": imported,
+            "failed": failed,
+            "errors": errors,
+            "by_ticket_type": dict(per_type),
+            "qr_job_id": qr_job_id
+        }
+
+    @staticmethod
+    def _generate_qr_codes(job_id: str, event_id: str, ticket_ids: List[str]) -> None:
+        """Render and upload QR images, a fan-out group at a time."""
+        bucket = supabase_admin.storage.from_(settings.STORAGE_BUCKET_NAME)
+        processed = failed = 0
+        JobService.update(job_id, status="running")
+
+        def upload(ticket_id: str):
+            def call() -> bool:
+                try:
+                    bucket.upload(
+                        ImportService._qr_path(event_id, ticket_id),
+                        render_ticket_qr(ticket_id),
+                        {"content-type": "image/png", "upsert": "true"}
+                    )
+                    return True
+                except Exception as e:
+                    print(f"QR upload failed for ticket {ticket_id}: {str(e)}")
+                    return False
+            return call
+
+        try:
+            group = settings.DB_FANOUT_WORKERS
+            for i in range(0, len(ticket_ids), group):
+                results = run_concurrently(*(upload(t) for t in ticket_ids[i:i + group]))
+                processed += sum(results)
+                failed += len(results) - sum(results)
+                JobService.update(job_id, processed=processed, failed=failed)
+            JobService.update(job_id, status="completed")
+        except Exception as e:
+            JobService.update(job_id, status="failed", error=str(e))
@@ -0,0 +1,97 @@
+from typing import Dict, Any, Optional
+from datetime import datetime, timedelta, timezone
+from fastapi import HTTPException, status
+import threading
+import uuid
+
+from app.core.supabase import supabase_admin
+from app.utils.dates import parse_timestamp
+
+
+# Jobs started by this worker. Progress is also written to bulk_jobs so a
+# poll that lands on another worker still finds the job.
+_jobs: Dict[str, Dict[str, Any]] = {}
+_lock = threading.Lock()
+
+JOB_COLUMNS = (
+    "id", "organizer_id", "event_id", "kind", "status", "total", "processed",
+    "failed", "error", "created_at", "updated_at", "finished_at"
+)
+
+
+class JobService:
+    """Progress tracking for background bulk operations"""
+
+    @staticmethod
+    def _persist(job: Dict[str, Any]) -> None:
+        try:
+            supabase_admin.table("bulk_jobs").upsert(job, on_conflict="id").execute()
+        except Exception as e:
+            # Progress is still served from memory by the worker running the job
+            print(f"Job progress write failed for {job['id']}: {str(e)}")
+
+    @staticmethod
+    def create(
+        organizer_id: str,
+        event_id: str,
+        kind: str,
+        total: Optional[int] = None
+    ) -> Dict[str, Any]:
+        now = datetime.now(timezone.utc).isoformat()
+        job = {
+            "id": str(uuid.uuid4()),
+            "organizer_id": organizer_id,
+            "event_id": event_id,
+            "kind": kind,
+            "status": "queued",
+            "total": total,
+            "processed": 0,
+            "failed": 0,
+            "error": None,
+            "created_at": now,
+            "updated_at": now,
+            "finished_at": None
+        }
+        # Finished jobs stay pollable from bulk_jobs; drop them from memory
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=1)
+        with _lock:
+            for job_id in [
+                j["id"] for j in _jobs.values()
+                if j["finished_at"] and parse_timestamp(j["finished_at"]) < cutoff
+            ]:
+                del _jobs[job_id]
+            _jobs[job["id"]] = job
+        JobService._persist(job)
+        return dict(job)
+
+    @staticmethod
+    def update(job_id: str, **fields: Any) -> None:
+        """Apply progress fields; a terminal status also stamps finished_at."""
+        now = datetime.now(timezone.utc).isoformat()
+        with _lock:
+            job = _jobs[job_id]
+            job.update(fields, updated_at=now)
+            if fields.get("status") in ("completed", "failed"):
+                job["finished_at"] = now
+            snapshot = dict(job)
+        JobService._persist(snapshot)
+
+    @staticmethod
+    def get(job_id: str, organizer_id: str) -> Dict[str, Any]:
+        with _lock:
+            job = _jobs.get(job_id)
+            job = dict(job) if job else None
+
+        if job is None:
+            result = supabase_admin.table("bulk_jobs")\
+                .select(", ".join(JOB_COLUMNS))\
+                .eq("id", job_id)\
+                .execute()
+            job = result.data[0] if result.data else None
+
+        if job is None or job["organizer_id"] != organizer_id:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Job not found"
+            )
+        return job
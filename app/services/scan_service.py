@@ -2,6 +2,41 @@ from typing import Dict, Any, List, Optional
 from fastapi import HTTPException, status
 from datetime import datetime, timezone
 from app.core.supabase import supabase, supabase_admin
+from app.services.activity_service import ActivityService
+from app.services.gate_lookup_service import GateLookupService
+from app.utils.concurrency import run_concurrently
+from app.utils.projections import Projection
+
+
+SCAN_TICKET_PROJECTION = Projection(
+    "id", "event_id", "status", "customer_email", "ticket_type_name", "checked_in_at"
+)
+EVENT_ORDER_PROJECTION = Projection(
+    "id", "reference", "customer_email", "quantity", "amount", "status", "created_at",
+    embeds={
+        "ticket_types": Projection("name"),
+        "tickets": Projection("id", "status", "ticket_type_name")
+    }
+)
+ORDER_SEARCH_PROJECTION = Projection(
+    *EVENT_ORDER_PROJECTION.columns, "event_id",
+    embeds={
+        **EVENT_ORDER_PROJECTION.embeds,
+        "events!inner": Projection("title")
+    }
+)
+TICKET_LIST_PROJECTION = Projection(
+    "id", "event_id", "order_id", "customer_email", "ticket_type_name", "status",
+    "qr_code_url", "checked_in_at", "created_at",
+    embeds={"events!inner": Projection("title")}
+)
+TICKET_DETAIL_PROJECTION = Projection(
+    *TICKET_LIST_PROJECTION.columns,
+    embeds={"events": Projection("title", "organizer_id")}
+)
+
+# Ids per grouped tickets read in get_tickets_batch
+TICKET_BATCH_CHUNK_SIZE = 100
 
 
 class ScanService:
@@ -23,14 +58,16 @@ class ScanService:
 
     @staticmethod
     def scan_ticket(event_id: str, ticket_id: str, organizer_id: str) -> Dict[str, Any]:
-        event = ScanService._verify_event_ownership(event_id, organizer_id)
-
         # Search by ticket ID only first
-        ticket_result = supabase_admin.table("tickets")\
-            .select("*")\
+        ticket_query = supabase_admin.table("tickets")\
+            .select(SCAN_TICKET_PROJECTION.select)\
             .eq("id", ticket_id)\
-            .single()\
-            .execute()
+            .single()
+
+        event, ticket_result = run_concurrently(
+            lambda: ScanService._verify_event_ownership(event_id, organizer_id),
+            ticket_query.execute
+        )
 
         if not ticket_result.data:
             return {
@@ -40,7 +77,7 @@ class ScanService:
                 "event_title": event["title"]
             }
 
-        ticket = ticket_result.data
+        ticket = SCAN_TICKET_PROJECTION.row(ticket_result.data)
 
         # Check if ticket belongs to the correct event
         if ticket["event_id"] != event_id:
@@ -82,6 +119,15 @@ class ScanService:
             "checked_in_at": now
         }).eq("id", ticket_id).execute()
 
+        GateLookupService.apply_check_in(event_id, ticket_id, now)
+        ActivityService.record(
+            organizer_id=organizer_id,
+            event_id=event_id,
+            event_title=event["title"],
+            activity_type="check_in",
+            description=f"{attendee_email or 'An attendee'} checked in"
+        )
+
         return {
             "valid": True,
             "ticket_id": ticket_id,
@@ -93,44 +139,73 @@ class ScanService:
             "checked_in_at": now
         }
 
+    @staticmethod
+    def _fetch_event_stats(event_ids: List[str], organizer_id: str) -> List[Dict[str, Any]]:
+        # Aggregated in the database: a few rows per event instead of every
+        # ticket and order, which max-rows would silently truncate
+        result = supabase.rpc("event_stats_batch", {
+            "p_event_ids": event_ids,
+            "p_organizer_id": organizer_id
+        }).execute()
+        return result.data or []
+
     @staticmethod
     def get_event_stats(event_id: str, organizer_id: str) -> Dict[str, Any]:
-        event = ScanService._verify_event_ownership(event_id, organizer_id)
+        rows = ScanService._fetch_event_stats([event_id], organizer_id)
+        if not rows:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Event not found or you do not have permission to access it"
+            )
 
-        tickets_result = supabase_admin.table("tickets")\
-            .select("id, status, ticket_type_name")\
-            .eq("event_id", event_id)\
-            .execute()
+        return ScanService._build_event_stats(**rows[0])
 
-        tickets = tickets_result.data or []
-        tickets_sold = len(tickets)
-        tickets_checked_in = sum(1 for t in tickets if t["status"] == "used")
-        tickets_active = sum(1 for t in tickets if t["status"] == "active")
+    @staticmethod
+    def get_event_stats_batch(event_ids: List[str], organizer_id: str) -> Dict[str, Any]:
+        # One round trip regardless of how many events are requested
+        event_ids = list(dict.fromkeys(event_ids))
+
+        # Only events the organizer owns come back
+        rows = {
+            r["event"]["id"]: r
+            for r in ScanService._fetch_event_stats(event_ids, organizer_id)
+        }
 
-        orders_result = supabase_admin.table("orders")\
-            .select("amount, quantity")\
-            .eq("event_id", event_id)\
-            .eq("status", "paid")\
-            .execute()
+        stats = [
+            ScanService._build_event_stats(**rows[event_id])
+            for event_id in event_ids if event_id in rows
+        ]
 
-        total_revenue = sum(float(o["amount"]) for o in (orders_result.data or []))
+        return {
+            "stats": stats,
+            "missing_event_ids": [e for e in event_ids if e not in rows]
+        }
+
+    @staticmethod
+    def _build_event_stats(
+        event: Dict[str, Any],
+        ticket_counts: List[Dict[str, Any]],
+        revenue: float,
+        ticket_types: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        # ticket_counts holds one {ticket_type_name, status, count} per group
+        tickets_sold = sum(c["count"] for c in ticket_counts)
+        tickets_checked_in = sum(c["count"] for c in ticket_counts if c["status"] == "used")
+        tickets_active = sum(c["count"] for c in ticket_counts if c["status"] == "active")
+
+        total_revenue = float(revenue or 0)
         check_in_rate = round((tickets_checked_in / tickets_sold * 100), 1) if tickets_sold > 0 else 0.0
 
         type_counts: Dict[str, Dict] = {}
-        for t in tickets:
-            name = t.get("ticket_type_name") or "General"
+        for c in ticket_counts:
+            name = c.get("ticket_type_name") or "General"
             if name not in type_counts:
                 type_counts[name] = {"name": name, "sold": 0, "checked_in": 0}
-            type_counts[name]["sold"] += 1
-            if t["status"] == "used":
-                type_counts[name]["checked_in"] += 1
+            type_counts[name]["sold"] += c["count"]
+            if c["status"] == "used":
+                type_counts[name]["checked_in"] += c["count"]
 
-        tt_result = supabase_admin.table("ticket_types")\
-            .select("name, quantity_available, quantity_sold, price")\
-            .eq("event_id", event_id)\
-            .execute()
-
-        for tt in (tt_result.data or []):
+        for tt in ticket_types:
             name = tt["name"]
             if name in type_counts:
                 type_counts[name]["quantity_available"] = tt["quantity_available"]
@@ -148,7 +223,7 @@ class ScanService:
         sold_out = (tickets_sold >= capacity) if capacity else False
 
         return {
-            "event_id": event_id,
+            "event_id": event["id"],
             "event_title": event["title"],
             "total_capacity": capacity,
             "tickets_sold": tickets_sold,
@@ -161,74 +236,111 @@ class ScanService:
         }
 
     @staticmethod
-    def get_event_attendees(event_id: str, organizer_id: str) -> Dict[str, Any]:
-        ScanService._verify_event_ownership(event_id, organizer_id)
+    def _to_attendee(t: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "ticket_id": t["id"],
+            "attendee_name": t.get("customer_email", "Unknown"),
+            "attendee_email": t.get("customer_email"),
+            "ticket_type": t.get("ticket_type_name"),
+            "status": t["status"],
+            "checked_in_at": t.get("checked_in_at"),
+            "purchased_at": t["created_at"]
+        }
 
-        result = supabase_admin.table("tickets")\
-            .select("id, status, ticket_type_name, checked_in_at, created_at, customer_email")\
-            .eq("event_id", event_id)\
-            .order("created_at", desc=True)\
-            .execute()
+    @staticmethod
+    def get_event_attendees(
+        event_id: str,
+        organizer_id: str,
+        updated_since: Optional[str] = None
+    ) -> Dict[str, Any]:
+        query = supabase_admin.table("tickets")\
+            .select("id, status, ticket_type_name, checked_in_at, created_at, updated_at, customer_email")\
+            .eq("event_id", event_id)
+
+        if updated_since is None:
+            _, result = run_concurrently(
+                lambda: ScanService._verify_event_ownership(event_id, organizer_id),
+                query.order("created_at", desc=True).execute
+            )
+            tickets = result.data or []
+            attendees = [ScanService._to_attendee(t) for t in tickets]
 
-        attendees = []
-        for t in (result.data or []):
-            attendees.append({
-                "ticket_id": t["id"],
-                "attendee_name": t.get("customer_email", "Unknown"),
-                "attendee_email": t.get("customer_email"),
-                "ticket_type": t.get("ticket_type_name"),
-                "status": t["status"],
-                "checked_in_at": t.get("checked_in_at"),
-                "purchased_at": t["created_at"]
-            })
+            return {
+                "attendees": attendees,
+                "total": len(attendees),
+                "checked_in": sum(1 for a in attendees if a["status"] == "used"),
+                "pending": sum(1 for a in attendees if a["status"] == "active"),
+                "watermark": max((t["updated_at"] for t in tickets if t.get("updated_at")), default=None)
+            }
 
-        checked_in = sum(1 for a in attendees if a["status"] == "used")
-        pending = sum(1 for a in attendees if a["status"] == "active")
+        # Delta sync: only rows touched since the watermark, plus counters
+        # computed server-side so the full list never leaves the database.
+        # gte rather than gt so writes sharing the watermark's timestamp are
+        # re-sent instead of missed; clients apply rows idempotently by ticket_id.
+        def count_query(ticket_status: Optional[str] = None):
+            q = supabase_admin.table("tickets")\
+                .select("id", count="exact")\
+                .eq("event_id", event_id)
+            if ticket_status:
+                q = q.eq("status", ticket_status)
+            return q.limit(1)
+
+        _, result, total_result, checked_in_result, pending_result = run_concurrently(
+            lambda: ScanService._verify_event_ownership(event_id, organizer_id),
+            query.gte("updated_at", updated_since).order("updated_at", desc=False).execute,
+            count_query().execute,
+            count_query("used").execute,
+            count_query("active").execute
+        )
+        tickets = result.data or []
 
         return {
-            "attendees": attendees,
-            "total": len(attendees),
-            "checked_in": checked_in,
-            "pending": pending
+            "attendees": [ScanService._to_attendee(t) for t in tickets],
+            "total": total_result.count or 0,
+            "checked_in": checked_in_result.count or 0,
+            "pending": pending_result.count or 0,
+            "watermark": tickets[-1]["updated_at"] if tickets else updated_since
         }
 
     @staticmethod
-    def get_event_orders(event_id: str, organizer_id: str) -> Dict[str, Any]:
-        ScanService._verify_event_ownership(event_id, organizer_id)
-
-        result = supabase_admin.table("orders")\
-            .select("*, ticket_types(name)")\
-            .eq("event_id", event_id)\
-            .order("created_at", desc=True)\
-            .execute()
-
-        orders = []
-        total_revenue = 0.0
+    def _to_order_item(o: Dict[str, Any]) -> Dict[str, Any]:
+        tt = o.get("ticket_types") or {}
+        return {
+            "id": o["id"],
+            "reference": o["reference"],
+            "customer_email": o.get("customer_email"),
+            "customer_name": o.get("customer_email"),
+            "quantity": o["quantity"],
+            "amount": float(o.get("amount", 0)),
+            "status": o["status"],
+            "ticket_type": tt.get("name"),
+            "created_at": o["created_at"],
+            "tickets": o.get("tickets") or []
+        }
 
-        for o in (result.data or []):
-            tt = o.pop("ticket_types", {}) or {}
+    @staticmethod
+    def _escape_like(value: str) -> str:
+        """Escape LIKE wildcards so user input only ever matches literally."""
+        return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
 
-            tickets_res = supabase_admin.table("tickets")\
-                .select("id, status, ticket_type_name")\
-                .eq("order_id", o["id"])\
-                .execute()
+    @staticmethod
+    def get_event_orders(event_id: str, organizer_id: str) -> Dict[str, Any]:
+        # Embed each order's tickets instead of querying them per order
+        query = supabase_admin.table("orders")\
+            .select(EVENT_ORDER_PROJECTION.select)\
+            .eq("event_id", event_id)\
+            .order("created_at", desc=True)
 
-            amount = float(o.get("amount", 0))
-            if o.get("status") == "paid":
-                total_revenue += amount
+        _, result = run_concurrently(
+            lambda: ScanService._verify_event_ownership(event_id, organizer_id),
+            query.execute
+        )
 
-            orders.append({
-                "id": o["id"],
-                "reference": o["reference"],
-                "customer_email": o.get("customer_email"),
-                "customer_name": o.get("customer_email"),
-                "quantity": o["quantity"],
-                "amount": amount,
-                "status": o["status"],
-                "ticket_type": tt.get("name"),
-                "created_at": o["created_at"],
-                "tickets": tickets_res.data or []
-            })
+        orders = [
+            ScanService._to_order_item(o)
+            for o in EVENT_ORDER_PROJECTION.rows(result.data)
+        ]
+        total_revenue = sum(o["amount"] for o in orders if o["status"] == "paid")
 
         return {
             "orders": orders,
@@ -237,46 +349,117 @@ class ScanService:
         }
 
     @staticmethod
-    def get_all_tickets(organizer_id: str) -> Dict[str, Any]:
-        events_result = supabase.table("events")\
-            .select("id, title")\
-            .eq("organizer_id", organizer_id)\
-            .execute()
+    def search_orders(
+        organizer_id: str,
+        reference: Optional[str] = None,
+        customer_email: Optional[str] = None,
+        limit: int = 50
+    ) -> Dict[str, Any]:
+        if not reference and not customer_email:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Provide an order reference or a customer email"
+            )
 
-        event_ids = [e["id"] for e in (events_result.data or [])]
-        event_map = {e["id"]: e["title"] for e in (events_result.data or [])}
+        # One query across every owned event: ownership through the inner
+        # events join, tickets embedded, and the lookup on the indexed
+        # reference / customer_email columns
+        query = supabase_admin.table("orders")\
+            .select(ORDER_SEARCH_PROJECTION.select)\
+            .eq("events.organizer_id", organizer_id)
 
-        if not event_ids:
-            return {"tickets": [], "total": 0}
+        if reference:
+            query = query.eq("reference", reference.strip())
+        if customer_email:
+            query = query.ilike("customer_email", ScanService._escape_like(customer_email.strip()))
 
-        result = supabase_admin.table("tickets")\
-            .select("*")\
-            .in_("event_id", event_ids)\
+        result = query\
             .order("created_at", desc=True)\
+            .limit(limit)\
             .execute()
 
-        tickets = []
-        for t in (result.data or []):
-            tickets.append({
-                "id": t["id"],
-                "event_id": t["event_id"],
-                "event_title": event_map.get(t["event_id"]),
-                "order_id": t.get("order_id"),
-                "customer_email": t.get("customer_email"),
-                "customer_name": t.get("customer_email"),
-                "ticket_type": t.get("ticket_type_name"),
-                "status": t["status"],
-                "qr_code_url": t.get("qr_code_url"),
-                "checked_in_at": t.get("checked_in_at"),
-                "created_at": t["created_at"]
+        orders = []
+        for o in ORDER_SEARCH_PROJECTION.rows(result.data):
+            event = o.get("events") or {}
+            orders.append({
+                **ScanService._to_order_item(o),
+                "event_id": o["event_id"],
+                "event_title": event.get("title")
             })
 
-        return {"tickets": tickets, "total": len(tickets)}
+        return {"orders": orders, "total": len(orders)}
+
+    @staticmethod
+    def _to_ticket_detail(t: Dict[str, Any]) -> Dict[str, Any]:
+        event = t.get("events") or {}
+        return {
+            "id": t["id"],
+            "event_id": t["event_id"],
+            "event_title": event.get("title"),
+            "order_id": t.get("order_id"),
+            "customer_email": t.get("customer_email"),
+            "customer_name": t.get("customer_email"),
+            "ticket_type": t.get("ticket_type_name"),
+            "status": t["status"],
+            "qr_code_url": t.get("qr_code_url"),
+            "checked_in_at": t.get("checked_in_at"),
+            "created_at": t["created_at"]
+        }
+
+    @staticmethod
+    def get_all_tickets(
+        organizer_id: str,
+        event_id: Optional[str] = None,
+        ticket_status: Optional[str] = None,
+        ticket_type: Optional[str] = None,
+        created_from: Optional[str] = None,
+        created_to: Optional[str] = None,
+        customer_email: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0
+    ) -> Dict[str, Any]:
+        # Filter on the embedded event so ownership and tickets come back in one
+        # query; every other filter is pushed into PostgREST as well so only
+        # matching rows, and only the projected columns, leave the database
+        query = supabase_admin.table("tickets")\
+            .select(
+                TICKET_LIST_PROJECTION.select,
+                count="exact" if limit is not None else None
+            )\
+            .eq("events.organizer_id", organizer_id)
+
+        if event_id:
+            query = query.eq("event_id", event_id)
+        if ticket_status:
+            query = query.eq("status", ticket_status)
+        if ticket_type:
+            query = query.eq("ticket_type_name", ticket_type)
+        if created_from:
+            query = query.gte("created_at", created_from)
+        if created_to:
+            query = query.lt("created_at", created_to)
+        if customer_email:
+            # Case-insensitive exact match
+            query = query.ilike("customer_email", ScanService._escape_like(customer_email))
+
+        query = query.order("created_at", desc=True)
+        if limit is not None:
+            query = query.range(offset, offset + limit - 1)
+
+        result = query.execute()
+
+        tickets = [
+            ScanService._to_ticket_detail(t)
+            for t in TICKET_LIST_PROJECTION.rows(result.data)
+        ]
+
+        total = result.count if limit is not None and result.count is not None else len(tickets)
+        return {"tickets": tickets, "total": total}
 
     @staticmethod
     def get_ticket_by_id(ticket_id: str, organizer_id: str) -> Dict[str, Any]:
         result = supabase_admin.table("tickets")\
-            .select("*, events(title, organizer_id)")\
+            .select(TICKET_DETAIL_PROJECTION.select)\
             .eq("id", ticket_id)\
             .single()\
             .execute()
@@ -287,8 +470,8 @@ class ScanService:
                 detail="Ticket not found"
             )
 
-        ticket = result.data
-        event = ticket.pop("events", {}) or {}
+        ticket = TICKET_DETAIL_PROJECTION.row(result.data)
+        event = ticket.get("events") or {}
 
         if event.get("organizer_id") != organizer_id:
             raise HTTPException(
@@ -296,16 +479,36 @@ class ScanService:
                 detail="You do not have permission to view this ticket"
             )
 
+        return ScanService._to_ticket_detail(ticket)
+
+    @staticmethod
+    def get_tickets_batch(ticket_ids: List[str], organizer_id: str) -> Dict[str, Any]:
+        ticket_ids = list(dict.fromkeys(ticket_ids))
+
+        # The inner join applies the organizer check to every row at once;
+        # ids are chunked to keep each request URL a sane length
+        chunks = [
+            ticket_ids[i:i + TICKET_BATCH_CHUNK_SIZE]
+            for i in range(0, len(ticket_ids), TICKET_BATCH_CHUNK_SIZE)
+        ]
+        queries = [
+            supabase_admin.table("tickets")\
+                .select(TICKET_LIST_PROJECTION.select)\
+                .in_("id", chunk)\
+                .eq("events.organizer_id", organizer_id)
+            for chunk in chunks
+        ]
+        results = run_concurrently(*(q.execute for q in queries))
+
+        found = {
+            t["id"]: ScanService._to_ticket_detail(t)
+            for result in results
+            for t in TICKET_LIST_PROJECTION.rows(result.data)
+        }
+
+        # Tickets that do not exist and tickets on other organizers' events
+        # are reported the same way, so ids cannot be probed
         return {
-            "id": ticket["id"],
-            "event_id": ticket["event_id"],
-            "event_title": event.get("title"),
-            "order_id": ticket.get("order_id"),
-            "customer_email": ticket.get("customer_email"),
-            "customer_name": ticket.get("customer_email"),
-            "ticket_type": ticket.get("ticket_type_name"),
-            "status": ticket["status"],
-            "qr_code_url": ticket.get("qr_code_url"),
-            "checked_in_at": ticket.get("checked_in_at"),
-            "created_at": ticket["created_at"]
+            "tickets": [found[t] for t in ticket_ids if t in found],
+            "missing_ticket_ids": [t for t in ticket_ids if t not in found]
         }
\ No newline at end of file
@@ -3,6 +3,16 @@ from fastapi import HTTPException, status
 from datetime import datetime
 
 from app.core.supabase import supabase
+from app.services.activity_service import ActivityService
+from app.utils.concurrency import run_concurrently
+from app.utils.projections import Projection
+
+
+CHECKIN_EVENT_PROJECTION = Projection("id", "organizer_id")
+CHECKIN_PROJECTION = Projection(
+    "id", "event_id", "ticket_code", "attendee_name", "attendee_email",
+    "ticket_type_name", "status", "checked_in_at"
+)
 
 
 class ScannerService:
@@ -67,6 +77,14 @@ class ScannerService:
                     detail="Failed to check in ticket"
                 )
             
+            ActivityService.record(
+                organizer_id=organizer_id,
+                event_id=ticket["event_id"],
+                event_title=ticket["events"]["title"],
+                activity_type="check_in",
+                description=f"{ticket.get('attendee_email') or 'An attendee'} checked in"
+            )
+            
             return {
                 "success": True,
                 "message": "Ticket checked in successfully",
@@ -161,37 +179,42 @@ class ScannerService:
     def get_event_checkins(event_id: str, organizer_id: str) -> List[Dict[str, Any]]:
         """Get all checked-in tickets for an event."""
         try:
-            # Verify event ownership
-            event_response = (
+            event_query = (
                 supabase.table("events")
-                .select("*")
+                .select(CHECKIN_EVENT_PROJECTION.select)
                 .eq("id", event_id)
-                .execute()
             )
             
+            checkins_query = (
+                supabase.table("tickets")
+                .select(CHECKIN_PROJECTION.select)
+                .eq("event_id", event_id)
+                .eq("status", "checked_in")
+                .order("checked_in_at", desc=True)
+            )
+            
+            # Fetch check-ins alongside the ownership lookup; they are only
+            # returned once ownership is confirmed below
+            event_response, response = run_concurrently(
+                event_query.execute,
+                checkins_query.execute
+            )
+            
+            # Verify event ownership
             if not event_response.data:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="Event not found"
                 )
             
-            if event_response.data[0]["organizer_id"] != organizer_id:
+            event = CHECKIN_EVENT_PROJECTION.row(event_response.data[0])
+            if event["organizer_id"] != organizer_id:
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail="Not authorized to access this event"
                 )
             
-            # Get checked-in tickets
-            response = (
-                supabase.table("tickets")
-                .select("*")
-                .eq("event_id", event_id)
-                .eq("status", "checked_in")
-                .order("checked_in_at", desc=True)
-                .execute()
-            )
-            
-            return response.data
+            return CHECKIN_PROJECTION.rows(response.data)
         
         except HTTPException:
             raise
@@ -5,6 +5,17 @@ from collections import defaultdict
 
 from app.core.supabase import supabase
 from app.services.event_service import EventService
+from app.utils.concurrency import run_concurrently
+from app.utils.projections import Projection
+
+
+# Columns _build_sales_report reads
+SALES_EVENT_PROJECTION = Projection("id", "title", "capacity", "organizer_id")
+SALES_TICKET_PROJECTION = Projection("status", "price")
+ORGANIZER_SALES_TICKET_PROJECTION = Projection(
+    "event_id", "status", "price",
+    embeds={"events!inner": Projection("organizer_id")}
+)
 
 
 class SalesService:
@@ -14,42 +25,24 @@ class SalesService:
     def get_event_sales_report(event_id: str, organizer_id: str) -> Dict[str, Any]:
         """Get sales report for a specific event."""
         try:
-            # Verify event ownership and get event details
-            event = EventService.get_event_by_id_with_auth(event_id, organizer_id)
-            
-            # Get tickets for this event
-            tickets_response = (
+            tickets_query = (
                 supabase.table("tickets")
-                .select("*")
+                .select(SALES_TICKET_PROJECTION.select)
                 .eq("event_id", event_id)
-                .execute()
             )
-            tickets = tickets_response.data
-            
-            # Calculate statistics
-            active_tickets = [t for t in tickets if t.get("status") != "cancelled"]
-            total_tickets_sold = len(active_tickets)
-            total_revenue = sum(float(t.get("price", 0)) for t in active_tickets)
             
-            # Calculate average ticket price
-            avg_ticket_price = (
-                total_revenue / total_tickets_sold 
-                if total_tickets_sold > 0 
-                else 0
+            # Verify event ownership while the tickets are fetched
+            event, tickets_response = run_concurrently(
+                lambda: EventService.get_event_by_id_with_auth(
+                    event_id, organizer_id, SALES_EVENT_PROJECTION
+                ),
+                tickets_query.execute
             )
             
-            # Get remaining capacity
-            capacity = event.get("capacity")
-            tickets_available = capacity - total_tickets_sold if capacity else None
-            
-            return {
-                "event_id": event_id,
-                "event_title": event["title"],
-                "total_tickets_sold": total_tickets_sold,
-                "total_revenue": total_revenue,
-                "tickets_available": tickets_available,
-                "average_ticket_price": avg_ticket_price
-            }
+            return SalesService._build_sales_report(
+                event,
+                SALES_TICKET_PROJECTION.rows(tickets_response.data)
+            )
         
         except HTTPException:
             raise
@@ -59,26 +52,58 @@ class SalesService:
                 detail=f"Failed to retrieve sales report: {str(e)}"
             )
     
+    @staticmethod
+    def _build_sales_report(event: Dict[str, Any], tickets: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Aggregate an event's tickets into a sales report."""
+        # Calculate statistics
+        active_tickets = [t for t in tickets if t.get("status") != "cancelled"]
+        total_tickets_sold = len(active_tickets)
+        total_revenue = sum(float(t.get("price", 0)) for t in active_tickets)
+        
+        # Calculate average ticket price
+        avg_ticket_price = (
+            total_revenue / total_tickets_sold 
+            if total_tickets_sold > 0 
+            else 0
+        )
+        
+        # Get remaining capacity
+        capacity = event.get("capacity")
+        tickets_available = capacity - total_tickets_sold if capacity else None
+        
+        return {
+            "event_id": event["id"],
+            "event_title": event["title"],
+            "total_tickets_sold": total_tickets_sold,
+            "total_revenue": total_revenue,
+            "tickets_available": tickets_available,
+            "average_ticket_price": avg_ticket_price
+        }
+    
     @staticmethod
     def get_all_sales_reports(organizer_id: str) -> List[Dict[str, Any]]:
         """Get sales reports for all organizer's events."""
         try:
-            # Get all organizer's events
-            events = EventService.get_organizer_events(organizer_id)
-            
-            reports = []
-            for event in events:
-                try:
-                    report = SalesService.get_event_sales_report(
-                        event_id=event["id"],
-                        organizer_id=organizer_id
-                    )
-                    reports.append(report)
-                except Exception:
-                    # Skip events with errors
-                    continue
+            tickets_query = (
+                supabase.table("tickets")
+                .select(ORGANIZER_SALES_TICKET_PROJECTION.select)
+                .eq("events.organizer_id", organizer_id)
+            )
             
-            return reports
+            # Fetch all events and all their tickets at once instead of per event
+            events, tickets_response = run_concurrently(
+                lambda: EventService.get_organizer_events(organizer_id),
+                tickets_query.execute
+            )
+            
+            tickets_by_event = defaultdict(list)
+            for ticket in ORGANIZER_SALES_TICKET_PROJECTION.rows(tickets_response.data):
+                tickets_by_event[ticket["event_id"]].append(ticket)
+            
+            return [
+                SalesService._build_sales_report(event, tickets_by_event[event["id"]])
+                for event in events
+            ]
         
         except Exception as e:
             raise HTTPException(
@@ -3,6 +3,12 @@
 from typing import Dict, Any, List, Optional
 from fastapi import HTTPException, status
 from app.core.supabase import supabase
+from app.utils.concurrency import run_concurrently
+from app.utils.etag import compute_etag
+
+
+# updated_at is stamped by a database trigger on every write, sales included
+TICKET_TYPE_VERSION_FIELDS = ("id", "updated_at", "quantity_sold")
 
 
 class TicketTypeService:
@@ -40,14 +46,16 @@ class TicketTypeService:
         description: Optional[str] = None,
         is_active: bool = True
     ) -> Dict[str, Any]:
-        TicketTypeService._verify_event_ownership(event_id, organizer_id)
-
         # Prevent duplicate names on the same event
-        existing = supabase.table("ticket_types")\
+        existing_query = supabase.table("ticket_types")\
             .select("id")\
             .eq("event_id", event_id)\
-            .ilike("name", name)\
-            .execute()
+            .ilike("name", name)
+
+        _, existing = run_concurrently(
+            lambda: TicketTypeService._verify_event_ownership(event_id, organizer_id),
+            existing_query.execute
+        )
         if existing.data:
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
@@ -73,14 +81,142 @@ class TicketTypeService:
         return TicketTypeService._format(result.data[0])
 
     @staticmethod
-    def get_ticket_types(event_id: str, organizer_id: str) -> List[Dict[str, Any]]:
-        TicketTypeService._verify_event_ownership(event_id, organizer_id)
+    def _find_duplicate_name(names: List[str]) -> Optional[str]:
+        """Return the first name that repeats, ignoring case."""
+        seen = set()
+        for name in names:
+            key = name.strip().lower()
+            if key in seen:
+                return name
+            seen.add(key)
+        return None
+
+    @staticmethod
+    def bulk_create_ticket_types(
+        event_id: str,
+        organizer_id: str,
+        ticket_types: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        # Existing names for the event, fetched once for the whole payload
+        existing_query = supabase.table("ticket_types")\
+            .select("name")\
+            .eq("event_id", event_id)
+
+        _, existing = run_concurrently(
+            lambda: TicketTypeService._verify_event_ownership(event_id, organizer_id),
+            existing_query.execute
+        )
+
+        names = [t["name"] for t in ticket_types]
+        duplicate = TicketTypeService._find_duplicate_name(names)
+        if duplicate:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Ticket type '{duplicate}' is listed more than once"
+            )
+
+        taken = {t["name"].strip().lower() for t in (existing.data or [])}
+        conflicts = [name for name in names if name.strip().lower() in taken]
+        if conflicts:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Ticket types already exist for this event: {', '.join(conflicts)}"
+            )
+
+        result = supabase.table("ticket_types").insert([
+            {
+                "event_id": event_id,
+                "name": t["name"],
+                "description": t.get("description"),
+                "price": t["price"],
+                "quantity_available": t["quantity_available"],
+                "quantity_sold": 0,
+                "is_active": t.get("is_active", True)
+            }
+            for t in ticket_types
+        ]).execute()
+
+        if not result.data:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to create ticket types"
+            )
+
+        return [TicketTypeService._format(t) for t in result.data]
+
+    @staticmethod
+    def bulk_update_ticket_types(
+        event_id: str,
+        organizer_id: str,
+        updates: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        ids = [u["id"] for u in updates]
+        if len(set(ids)) != len(ids):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Each ticket type may only be updated once per request"
+            )
+
+        # Only the columns each item changes; the rest stay as the database has them
+        payload = [
+            {k: v for k, v in update.items() if v is not None}
+            for update in updates
+        ]
+
+        # One all-or-nothing call: it locks the rows, checks ownership, the
+        # quantity_sold floor and name clashes, then updates in one statement
+        result = supabase.rpc("update_ticket_types_guarded", {
+            "p_event_id": event_id,
+            "p_organizer_id": organizer_id,
+            "p_updates": payload
+        }).execute()
+
+        outcome = result.data or {}
+        if outcome.get("ticket_types"):
+            return [TicketTypeService._format(t) for t in outcome["ticket_types"]]
 
-        result = supabase.table("ticket_types")\
+        reason = outcome.get("reason")
+        if reason == "not_found":
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Ticket types not found: {', '.join(outcome['ticket_type_ids'])}"
+            )
+        if reason == "quantity_below_sold":
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Cannot set quantity of '{outcome['name']}' below the number already sold ({outcome['quantity_sold']})"
+            )
+        if reason == "duplicate_name":
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"A ticket type named '{outcome['name']}' already exists for this event"
+            )
+        TicketTypeService._raise_guard_failure(reason)
+
+    @staticmethod
+    def get_ticket_types_etag(event_id: str, organizer_id: str) -> str:
+        query = supabase.table("ticket_types")\
+            .select(", ".join(TICKET_TYPE_VERSION_FIELDS))\
+            .eq("event_id", event_id)
+
+        _, result = run_concurrently(
+            lambda: TicketTypeService._verify_event_ownership(event_id, organizer_id),
+            query.execute
+        )
+
+        return compute_etag(result.data or [], TICKET_TYPE_VERSION_FIELDS)
+
+    @staticmethod
+    def get_ticket_types(event_id: str, organizer_id: str) -> List[Dict[str, Any]]:
+        query = supabase.table("ticket_types")\
             .select("*")\
             .eq("event_id", event_id)\
-            .order("created_at", desc=False)\
-            .execute()
+            .order("created_at", desc=False)
+
+        _, result = run_concurrently(
+            lambda: TicketTypeService._verify_event_ownership(event_id, organizer_id),
+            query.execute
+        )
 
         return [TicketTypeService._format(t) for t in (result.data or [])]
 
@@ -90,14 +226,16 @@ class TicketTypeService:
         event_id: str,
         organizer_id: str
     ) -> Dict[str, Any]:
-        TicketTypeService._verify_event_ownership(event_id, organizer_id)
-
-        result = supabase.table("ticket_types")\
+        query = supabase.table("ticket_types")\
             .select("*")\
             .eq("id", ticket_type_id)\
             .eq("event_id", event_id)\
-            .single()\
-            .execute()
+            .single()
+
+        _, result = run_concurrently(
+            lambda: TicketTypeService._verify_event_ownership(event_id, organizer_id),
+            query.execute
+        )
 
         if not result.data:
             raise HTTPException(
@@ -107,6 +245,34 @@ class TicketTypeService:
 
         return TicketTypeService._format(result.data)
 
+    @staticmethod
+    def _raise_guard_failure(reason: str, quantity_sold: Optional[int] = None) -> None:
+        """Translate a guarded write's failure reason into an HTTP error."""
+        if reason == "event_not_found":
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Event not found or you do not have permission to manage it"
+            )
+        if reason == "not_found":
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Ticket type not found"
+            )
+        if reason == "quantity_below_sold":
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Cannot set quantity below the number already sold ({quantity_sold})"
+            )
+        if reason == "has_sales":
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cannot delete a ticket type that has already sold tickets. Deactivate it instead."
+            )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to update ticket type"
+        )
+
     @staticmethod
     def update_ticket_type(
         ticket_type_id: str,
@@ -114,30 +280,6 @@ class TicketTypeService:
         organizer_id: str,
         updates: Dict[str, Any]
     ) -> Dict[str, Any]:
-        TicketTypeService._verify_event_ownership(event_id, organizer_id)
-
-        # Confirm ticket type exists on this event
-        existing = supabase.table("ticket_types")\
-            .select("*")\
-            .eq("id", ticket_type_id)\
-            .eq("event_id", event_id)\
-            .single()\
-            .execute()
-        if not existing.data:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Ticket type not found"
-            )
-
-        # Cannot reduce quantity_available below quantity_sold
-        if "quantity_available" in updates:
-            sold = existing.data["quantity_sold"]
-            if updates["quantity_available"] < sold:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Cannot set quantity below the number already sold ({sold})"
-                )
-
         clean = {k: v for k, v in updates.items() if v is not None}
         if not clean:
             raise HTTPException(
@@ -145,18 +287,23 @@ class TicketTypeService:
                 detail="No valid fields to update"
             )
 
-        result = supabase.table("ticket_types")\
-            .update(clean)\
-            .eq("id", ticket_type_id)\
-            .execute()
+        # One guarded UPDATE ... FROM events: matches only when the type is on
+        # this event, the organizer owns the event and quantity_available stays
+        # >= quantity_sold. The reason is only worked out when nothing matched.
+        result = supabase.rpc("update_ticket_type_guarded", {
+            "p_ticket_type_id": ticket_type_id,
+            "p_event_id": event_id,
+            "p_organizer_id": organizer_id,
+            "p_updates": clean
+        }).execute()
 
-        if not result.data:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to update ticket type"
+        outcome = result.data or {}
+        if not outcome.get("ticket_type"):
+            TicketTypeService._raise_guard_failure(
+                outcome.get("reason"), outcome.get("quantity_sold")
             )
 
-        return TicketTypeService._format(result.data[0])
+        return TicketTypeService._format(outcome["ticket_type"])
 
     @staticmethod
     def delete_ticket_type(
@@ -164,29 +311,64 @@ class TicketTypeService:
         event_id: str,
         organizer_id: str
     ) -> None:
-        TicketTypeService._verify_event_ownership(event_id, organizer_id)
+        # One guarded DELETE ... USING events that also requires quantity_sold = 0
+        result = supabase.rpc("delete_ticket_type_guarded", {
+            "p_ticket_type_id": ticket_type_id,
+            "p_event_id": event_id,
+            "p_organizer_id": organizer_id
+        }).execute()
 
-        # Cannot delete if tickets have already been sold
-        existing = supabase.table("ticket_types")\
-            .select("quantity_sold")\
-            .eq("id", ticket_type_id)\
-            .eq("event_id", event_id)\
-            .single()\
-            .execute()
+        outcome = result.data or {}
+        if not outcome.get("deleted"):
+            TicketTypeService._raise_guard_failure(outcome.get("reason"))
+
+    @staticmethod
+    def reserve_quantities(event_id: str, counts: Dict[str, int]) -> None:
+        """Add to quantity_sold per type name, all or nothing, never past quantity_available.
+
+        The rows are locked and checked in one call, so a reservation racing
+        live sales cannot oversell a type.
+        """
+        counts = {name: count for name, count in counts.items() if count}
+        if not counts:
+            return
 
-        if not existing.data:
+        result = supabase.rpc("reserve_ticket_type_quantities", {
+            "p_event_id": event_id,
+            "p_counts": counts
+        }).execute()
+
+        outcome = result.data or {}
+        if outcome.get("reserved"):
+            return
+        if outcome.get("reason") == "insufficient":
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Only {outcome['remaining']} '{outcome['name']}' tickets remain; "
+                       f"{outcome['requested']} were requested"
+            )
+        if outcome.get("reason") == "not_found":
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Ticket type not found"
             )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to reserve ticket quantities"
+        )
 
-        if existing.data["quantity_sold"] > 0:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Cannot delete a ticket type that has already sold tickets. Deactivate it instead."
-            )
+    @staticmethod
+    def adjust_quantity_sold(event_id: str, deltas: Dict[str, int]) -> None:
+        """Apply per-type quantity_sold changes, keyed by ticket type name.
 
-        supabase.table("ticket_types")\
-            .delete()\
-            .eq("id", ticket_type_id)\
-            .execute()
+        One UPDATE ... FROM jsonb_each on the server, so every type moves in a
+        single atomic statement and concurrent sales are never overwritten.
+        """
+        deltas = {name: delta for name, delta in deltas.items() if delta}
+        if not deltas:
+            return
+
+        supabase.rpc("adjust_ticket_types_sold", {
+            "p_event_id": event_id,
+            "p_deltas": deltas
+        }).execute()
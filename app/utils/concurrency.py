@@ -0,0 +1,39 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List
+
+from app.core.config import settings
+
+
+# Shared pool for blocking Supabase calls that do not depend on each other.
+# Keep calls submitted here flat: a task must never fan out again into this
+# same pool, or a saturated pool can deadlock waiting on itself.
+_executor = ThreadPoolExecutor(
+    max_workers=settings.DB_FANOUT_WORKERS,
+    thread_name_prefix="db-fanout"
+)
+
+# Long-running bulk jobs get their own threads so they never hold fan-out
+# workers for minutes, and may themselves call run_concurrently safely.
+_job_executor = ThreadPoolExecutor(
+    max_workers=settings.BULK_JOB_WORKERS,
+    thread_name_prefix="bulk-job"
+)
+
+
+def run_concurrently(*calls: Callable[[], Any]) -> List[Any]:
+    """Run independent blocking calls in parallel and return results in order."""
+    if len(calls) == 1:
+        return [calls[0]()]
+
+    futures = [_executor.submit(call) for call in calls]
+    return [future.result() for future in futures]
+
+
+def run_in_background(call: Callable[[], Any]) -> None:
+    """Fire-and-forget a blocking call that must not delay the response."""
+    _executor.submit(call)
+
+
+def run_job(call: Callable[[], Any]) -> None:
+    """Start a long-running job in the background; it reports its own progress."""
+    _job_executor.submit(call)
@@ -0,0 +1,28 @@
+import hashlib
+import json
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+
+def compute_etag(rows: Iterable[Dict[str, Any]], fields: Sequence[str]) -> str:
+    """Build a strong ETag from the version columns of a set of rows.
+
+    Full reads and cheap version lookups must pass the same fields so both
+    produce the same tag for unchanged data.
+    """
+    versions: List[List[Any]] = sorted(
+        ([row.get(field) for field in fields] for row in rows),
+        key=lambda version: str(version[0])
+    )
+    digest = hashlib.sha1(json.dumps(versions, default=str).encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    # If-None-Match uses weak comparison, so ignore a W/ prefix
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
@@ -0,0 +1,43 @@
+from io import BytesIO
+from typing import Dict, Tuple
+
+from PIL import Image, ImageOps
+
+
+# Longest edge in pixels for each derivative
+VARIANT_SIZES: Dict[str, int] = {
+    "thumbnail": 320,
+    "card": 800,
+    "hero": 1600,
+}
+
+# (format, file extension, content type, save options)
+VARIANT_FORMATS: Tuple[Tuple[str, str, str, dict], ...] = (
+    ("JPEG", "jpg", "image/jpeg", {"quality": 82, "optimize": True, "progressive": True}),
+    ("WEBP", "webp", "image/webp", {"quality": 80, "method": 4}),
+)
+
+
+def render_variants(data: bytes) -> Dict[str, Dict[str, Tuple[str, bytes]]]:
+    """Resize an image into every variant size and format.
+
+    Runs in a worker process, so it only takes and returns plain bytes.
+    Returns {variant: {extension: (content_type, bytes)}}.
+    """
+    with Image.open(BytesIO(data)) as original:
+        # Respect camera rotation and drop alpha for JPEG output
+        source = ImageOps.exif_transpose(original).convert("RGB")
+
+    variants: Dict[str, Dict[str, Tuple[str, bytes]]] = {}
+    for name, edge in VARIANT_SIZES.items():
+        resized = source.copy()
+        # thumbnail() only ever shrinks, so small originals are not upscaled
+        resized.thumbnail((edge, edge), Image.LANCZOS)
+
+        variants[name] = {}
+        for fmt, extension, content_type, options in VARIANT_FORMATS:
+            buffer = BytesIO()
+            resized.save(buffer, format=fmt, **options)
+            variants[name][extension] = (content_type, buffer.getvalue())
+
+    return variants
@@ -0,0 +1,68 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+
+class Projection:
+    """The exact columns a query consumes, declared once next to its call site.
+
+    ``select`` renders the PostgREST column list. With DEBUG on, ``row`` and
+    ``rows`` wrap results so reading a column that was not projected raises
+    instead of quietly coming back as None.
+    """
+
+    def __init__(self, *columns: str, embeds: Optional[Dict[str, "Projection"]] = None):
+        self.columns: Tuple[str, ...] = columns
+        # {"events!inner": Projection("title")} -> events!inner(title)
+        self.embeds: Dict[str, "Projection"] = embeds or {}
+        self.keys = frozenset(columns) | {spec.split("!")[0] for spec in self.embeds}
+
+    @property
+    def select(self) -> str:
+        parts = list(self.columns)
+        parts += [f"{spec}({embed.select})" for spec, embed in self.embeds.items()]
+        return ", ".join(parts)
+
+    def row(self, data: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        if not settings.DEBUG or data is None:
+            return data
+        return ProjectedRow(data, self)
+
+    def rows(self, data: Optional[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        data = data or []
+        if not settings.DEBUG:
+            return data
+        return [ProjectedRow(r, self) for r in data]
+
+
+class ProjectedRow(dict):
+    """A result row that refuses reads of columns its query did not select."""
+
+    __slots__ = ("_projection",)
+
+    def __init__(self, data: Dict[str, Any], projection: Projection):
+        super().__init__(data)
+        self._projection = projection
+        for spec, embed in projection.embeds.items():
+            key = spec.split("!")[0]
+            nested = self.get(key)
+            if isinstance(nested, list):
+                dict.__setitem__(self, key, embed.rows(nested))
+            elif isinstance(nested, dict):
+                dict.__setitem__(self, key, embed.row(nested))
+
+    def _check(self, key: str) -> None:
+        # Keys assigned after the fetch are fine; only unfetched columns fail
+        if key not in self._projection.keys and not dict.__contains__(self, key):
+            raise KeyError(
+                f"Column '{key}' is read but not projected; select is "
+                f"'{self._projection.select}'"
+            )
+
+    def __getitem__(self, key: str) -> Any:
+        self._check(key)
+        return super().__getitem__(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        self._check(key)
+        return super().get(key, default)
@@ -0,0 +1,11 @@
+from io import BytesIO
+
+import qrcode
+
+
+def render_ticket_qr(ticket_id: str) -> bytes:
+    """Render the PNG QR code scanners read; it encodes the bare ticket id."""
+    image = qrcode.make(ticket_id, box_size=8, border=2)
+    buffer = BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
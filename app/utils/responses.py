@@ -0,0 +1,25 @@
+from typing import Any, Dict, Optional
+
+from fastapi import Response, status
+from pydantic import TypeAdapter
+
+
+def json_response(
+    adapter: TypeAdapter,
+    data: Any,
+    status_code: int = status.HTTP_200_OK,
+    headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """Validate service output once and serialize it straight to JSON bytes.
+
+    Returning a Response makes FastAPI skip its own response_model pass, so
+    the route's response_model is only used for the OpenAPI schema. Build
+    adapters once at import time; constructing a TypeAdapter is expensive.
+    """
+    content = adapter.dump_json(adapter.validate_python(data))
+    return Response(
+        content=content,
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json"
+    )
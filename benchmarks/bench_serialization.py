@@ -0,0 +1,86 @@
+"""Compare the old and fast JSON response paths on large ticket lists.
+
+Old path: handler builds TicketListResponse(**result) and FastAPI validates
+and serializes it again through response_model. Fast path: json_response
+validates once with a reusable TypeAdapter and dumps JSON bytes directly.
+
+Run from the repository root:
+
+    python benchmarks/bench_serialization.py [rows ...]
+"""
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+
+from app.schemas.scan import TicketListResponse
+from app.utils.responses import json_response
+
+
+def make_result(rows: int) -> dict:
+    tickets = [
+        {
+            "id": f"00000000-0000-0000-0000-{i:012d}",
+            "event_id": f"event-{i % 5}",
+            "event_title": f"Festival Stage {i % 5}",
+            "order_id": f"order-{i // 3}",
+            "customer_email": f"guest{i}@example.com",
+            "customer_name": f"guest{i}@example.com",
+            "ticket_type": ("Regular", "Premium", "VIP")[i % 3],
+            "status": ("active", "used", "cancelled")[i % 3],
+            "qr_code_url": f"https://cdn.example.com/qr/{i}.png",
+            "checked_in_at": "2026-10-19T05:59:00+00:00" if i % 3 == 1 else None,
+            "created_at": "2026-10-01T12:00:00+00:00"
+        }
+        for i in range(rows)
+    ]
+    return {"tickets": tickets, "total": rows}
+
+
+def build_app(result: dict) -> FastAPI:
+    app = FastAPI()
+    adapter = TypeAdapter(TicketListResponse)
+
+    @app.get("/old", response_model=TicketListResponse)
+    async def old_path():
+        return TicketListResponse(**result)
+
+    @app.get("/fast", response_model=TicketListResponse)
+    async def fast_path():
+        return json_response(adapter, result)
+
+    return app
+
+
+def time_it(call: Callable[[], object], repeat: int) -> float:
+    call()  # warm up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        call()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main() -> None:
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100, 1_000, 10_000]
+
+    print(f"{'rows':>8} {'old ms':>10} {'fast ms':>10} {'speedup':>9}")
+    for rows in sizes:
+        client = TestClient(build_app(make_result(rows)))
+        repeat = max(3, 20_000 // rows)
+
+        # Both paths must produce the same document
+        assert client.get("/old").json() == client.get("/fast").json()
+
+        old_ms = time_it(lambda: client.get("/old"), repeat)
+        fast_ms = time_it(lambda: client.get("/fast"), repeat)
+        print(f"{rows:>8} {old_ms:>10.2f} {fast_ms:>10.2f} {old_ms / fast_ms:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
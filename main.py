@@ -4,8 +4,10 @@ from fastapi.responses import JSONResponse
 from app.api import ticket_types
 
 from app.core.config import settings
+from app.core.compression import CompressionMiddleware
 from app.api import auth, events, dashboard, tickets, scanner, sales
 from app.api import scanning
+from app.api import jobs
 
 
 app = FastAPI(
@@ -22,6 +24,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compression Middleware
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MIN_SIZE,
+    gzip_level=settings.GZIP_LEVEL,
+    brotli_quality=settings.BROTLI_QUALITY,
+)
+
 # Include routers
 app.include_router(auth.router, prefix=settings.API_PREFIX)
 app.include_router(events.router, prefix=settings.API_PREFIX)
@@ -30,4 +40,5 @@ app.include_router(tickets.router, prefix=settings.API_PREFIX)
 app.include_router(scanner.router, prefix=settings.API_PREFIX)
 app.include_router(sales.router, prefix=settings.API_PREFIX) 
 app.include_router(ticket_types.router, prefix="/api")
-app.include_router(scanning.router, prefix="/api")
\ No newline at end of file
+app.include_router(scanning.router, prefix="/api")
+app.include_router(jobs.router, prefix="/api")
\ No newline at end of file
@@ -0,0 +1,63 @@
+-- Append-only feed behind /dashboard/recent-activity (ActivityService).
+-- Rows are written in the background after each event, scan and check-in
+-- write, and by the trigger below for purchases; the service tails them per
+-- organizer by created_at.
+
+create table if not exists public.activity_log (
+    id uuid primary key default gen_random_uuid(),
+    organizer_id uuid not null,
+    -- No foreign key: deletions are logged after the event row is gone
+    event_id uuid not null,
+    event_title text,
+    activity_type text not null,
+    description text not null,
+    created_at timestamptz not null default now()
+);
+
+create index if not exists activity_log_organizer_created_idx
+    on public.activity_log (organizer_id, created_at desc);
+
+alter table public.activity_log enable row level security;
+
+-- Purchases are made by the customer-facing backend, which knows nothing
+-- about this feed, so they are logged in the database whenever an order
+-- becomes paid, whichever service wrote it.
+create or replace function public.log_ticket_purchase()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+begin
+    insert into public.activity_log (
+        organizer_id, event_id, event_title, activity_type, description
+    )
+    select
+        e.organizer_id,
+        e.id,
+        e.title,
+        'ticket_purchase',
+        coalesce(nullif(new.customer_email, ''), 'A customer')
+            || ' bought ' || coalesce(new.quantity, 1)
+            || case when coalesce(new.quantity, 1) = 1 then ' ticket' else ' tickets' end
+    from public.events e
+    where e.id = new.event_id;
+
+    return null;
+end;
+$$;
+
+-- Once per order: when it is inserted paid, or first moves to paid
+drop trigger if exists orders_log_ticket_purchase on public.orders;
+create trigger orders_log_ticket_purchase
+    after insert on public.orders
+    for each row
+    when (new.status = 'paid')
+    execute function public.log_ticket_purchase();
+
+drop trigger if exists orders_log_ticket_purchase_paid on public.orders;
+create trigger orders_log_ticket_purchase_paid
+    after update of status on public.orders
+    for each row
+    when (new.status = 'paid' and old.status is distinct from 'paid')
+    execute function public.log_ticket_purchase();
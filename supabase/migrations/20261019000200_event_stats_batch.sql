@@ -0,0 +1,62 @@
+-- Ticket, revenue and ticket type aggregates for up to 100 events
+-- (ScanService.get_event_stats / get_event_stats_batch).
+--
+-- Grouping happens here so the response stays a few rows per event however
+-- many tickets were sold; downloading raw ticket rows through PostgREST is
+-- silently truncated at max-rows. The result is one jsonb value, which the
+-- max-rows cap does not apply to. Events not owned by p_organizer_id are
+-- left out, so the caller reports them as missing.
+
+create index if not exists tickets_event_status_idx
+    on public.tickets (event_id, status);
+
+create index if not exists orders_event_paid_idx
+    on public.orders (event_id) where status = 'paid';
+
+create or replace function public.event_stats_batch(
+    p_event_ids uuid[],
+    p_organizer_id uuid
+)
+returns jsonb
+language sql
+stable
+as $$
+    select coalesce(jsonb_agg(jsonb_build_object(
+        'event', jsonb_build_object('id', e.id, 'title', e.title, 'capacity', e.capacity),
+        'ticket_counts', coalesce((
+            select jsonb_agg(jsonb_build_object(
+                'ticket_type_name', c.ticket_type_name,
+                'status', c.status,
+                'count', c.n
+            ))
+            from (
+                select t.ticket_type_name, t.status, count(*) as n
+                from public.tickets t
+                where t.event_id = e.id
+                group by t.ticket_type_name, t.status
+            ) c
+        ), '[]'::jsonb),
+        'revenue', coalesce((
+            select sum(o.amount)
+            from public.orders o
+            where o.event_id = e.id and o.status = 'paid'
+        ), 0),
+        'ticket_types', coalesce((
+            select jsonb_agg(jsonb_build_object(
+                'name', tt.name,
+                'quantity_available', tt.quantity_available,
+                'quantity_sold', tt.quantity_sold,
+                'price', tt.price
+            ))
+            from public.ticket_types tt
+            where tt.event_id = e.id
+        ), '[]'::jsonb)
+    )), '[]'::jsonb)
+    from public.events e
+    where e.id = any(p_event_ids)
+      and e.organizer_id = p_organizer_id
+$$;
+
+-- Callers pass the organizer id themselves; only the backend may do that
+revoke execute on function public.event_stats_batch(uuid[], uuid) from public, anon, authenticated;
+grant execute on function public.event_stats_batch(uuid[], uuid) to service_role;
@@ -0,0 +1,25 @@
+-- tickets.updated_at is the delta-sync cursor for GET .../attendees and the
+-- gate lookup index. It is stamped here, by the database, on every insert
+-- and update, so the cursor never mixes app-server clocks with the
+-- database clock and no write path can forget to bump it.
+
+alter table public.tickets
+    add column if not exists updated_at timestamptz not null default now();
+
+create or replace function public.set_updated_at()
+returns trigger
+language plpgsql
+as $$
+begin
+    new.updated_at := now();
+    return new;
+end;
+$$;
+
+drop trigger if exists tickets_set_updated_at on public.tickets;
+create trigger tickets_set_updated_at
+    before insert or update on public.tickets
+    for each row execute function public.set_updated_at();
+
+create index if not exists tickets_event_updated_at_idx
+    on public.tickets (event_id, updated_at);
@@ -0,0 +1,25 @@
+-- Derived image sizes per event, keyed by the original image URL:
+-- {url: {variant: {extension: variant_url}}}.
+
+alter table public.events
+    add column if not exists image_variants jsonb not null default '{}'::jsonb;
+
+-- Merges one image's variants into the event in a single statement, so
+-- background jobs finishing at the same time (on any worker) cannot
+-- overwrite each other's entries. A deleted event simply matches no row.
+create or replace function public.merge_event_image_variants(
+    p_event_id uuid,
+    p_url text,
+    p_variants jsonb
+)
+returns void
+language sql
+as $$
+    update public.events
+    set image_variants = coalesce(image_variants, '{}'::jsonb) || jsonb_build_object(p_url, p_variants),
+        updated_at = now()
+    where id = p_event_id
+$$;
+
+revoke execute on function public.merge_event_image_variants(uuid, text, jsonb) from public, anon, authenticated;
+grant execute on function public.merge_event_image_variants(uuid, text, jsonb) to service_role;
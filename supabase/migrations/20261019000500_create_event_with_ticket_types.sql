@@ -0,0 +1,52 @@
+-- Creates an event and its ticket types in one transaction
+-- (EventService.create_event_with_details). A failing ticket type insert
+-- rolls the event back too, so no half-created event is left behind.
+--
+-- p_event carries the EventCreate fields plus organizer_id, image_urls and
+-- created_at; p_ticket_types is a list of TicketTypeCreate objects.
+-- Returns {event, ticket_types}.
+
+create or replace function public.create_event_with_ticket_types(
+    p_event jsonb,
+    p_ticket_types jsonb
+)
+returns jsonb
+language plpgsql
+as $$
+declare
+    v_event public.events;
+    v_ticket_types jsonb;
+begin
+    -- jsonb_populate_record casts each field to its column type
+    insert into public.events (
+        title, description, location, start_date, end_date, capacity,
+        ticket_price, category, organizer_id, image_urls, created_at
+    )
+    select
+        r.title, r.description, r.location, r.start_date, r.end_date, r.capacity,
+        r.ticket_price, r.category, r.organizer_id,
+        coalesce(r.image_urls, '{}'), coalesce(r.created_at, now())
+    from jsonb_populate_record(null::public.events, p_event) r
+    returning * into v_event;
+
+    with inserted as (
+        insert into public.ticket_types (
+            event_id, name, description, price, quantity_available, quantity_sold, is_active
+        )
+        select
+            v_event.id, r.name, r.description, r.price, r.quantity_available, 0,
+            coalesce(r.is_active, true)
+        from jsonb_populate_recordset(null::public.ticket_types, coalesce(p_ticket_types, '[]'::jsonb)) r
+        returning *
+    )
+    select coalesce(jsonb_agg(to_jsonb(inserted) order by inserted.created_at, inserted.name), '[]'::jsonb)
+    into v_ticket_types
+    from inserted;
+
+    return jsonb_build_object('event', to_jsonb(v_event), 'ticket_types', v_ticket_types);
+end;
+$$;
+
+-- organizer_id comes from the caller, so only the backend may call this
+revoke execute on function public.create_event_with_ticket_types(jsonb, jsonb) from public, anon, authenticated;
+grant execute on function public.create_event_with_ticket_types(jsonb, jsonb) to service_role;
@@ -0,0 +1,89 @@
+-- Content-addressed image index and the event image list RPCs used by
+-- app/services/image_service.py.
+
+-- One row per distinct image an organizer has stored; uploads of the same
+-- bytes reuse the existing object (and its rendered variants).
+create table if not exists public.image_hashes (
+    id uuid primary key default gen_random_uuid(),
+    organizer_id uuid not null,
+    content_hash text not null,
+    path text not null,
+    url text not null,
+    variants jsonb,
+    created_at timestamptz not null default now(),
+    unique (organizer_id, content_hash)
+);
+
+create index if not exists image_hashes_organizer_url_idx
+    on public.image_hashes (organizer_id, url);
+
+alter table public.image_hashes enable row level security;
+
+-- Appends URLs not already on the event, in the order given, and returns the
+-- full list. A single update, so concurrent appends cannot lose each other.
+create or replace function public.append_event_image_urls(
+    p_event_id uuid,
+    p_urls text[]
+)
+returns text[]
+language sql
+as $$
+    update public.events e
+    set image_urls = coalesce(e.image_urls, '{}') || array(
+            select u.url
+            from unnest(p_urls) with ordinality as u(url, ord)
+            where not (u.url = any(coalesce(e.image_urls, '{}')))
+            group by u.url
+            order by min(u.ord)
+        ),
+        updated_at = now()
+    where e.id = p_event_id
+    returning e.image_urls
+$$;
+
+-- Detaches URLs, and their rendered variants, from an event the organizer
+-- owns. Returns {removed, image_urls}, or null when the event is missing or
+-- owned by someone else.
+create or replace function public.remove_event_image_urls(
+    p_event_id uuid,
+    p_organizer_id uuid,
+    p_urls text[]
+)
+returns jsonb
+language plpgsql
+as $$
+declare
+    v_urls text[];
+    v_removed text[];
+begin
+    select coalesce(image_urls, '{}') into v_urls
+    from public.events
+    where id = p_event_id and organizer_id = p_organizer_id
+    for update;
+
+    if not found then
+        return null;
+    end if;
+
+    v_removed := array(select u from unnest(v_urls) u where u = any(p_urls));
+
+    update public.events
+    set image_urls = array(
+            select u.url
+            from unnest(v_urls) with ordinality as u(url, ord)
+            where not (u.url = any(p_urls))
+            order by u.ord
+        ),
+        image_variants = coalesce(image_variants, '{}'::jsonb) - p_urls,
+        updated_at = now()
+    where id = p_event_id
+    returning image_urls into v_urls;
+
+    return jsonb_build_object('removed', to_jsonb(v_removed), 'image_urls', to_jsonb(v_urls));
+end;
+$$;
+
+revoke execute on function public.append_event_image_urls(uuid, text[]) from public, anon, authenticated;
+grant execute on function public.append_event_image_urls(uuid, text[]) to service_role;
+revoke execute on function public.remove_event_image_urls(uuid, uuid, text[]) from public, anon, authenticated;
+grant execute on function public.remove_event_image_urls(uuid, uuid, text[]) to service_role;
@@ -0,0 +1,110 @@
+-- All-or-nothing bulk edit of an event's ticket types
+-- (TicketTypeService.bulk_update_ticket_types).
+--
+-- p_updates is a list of {id, ...changed columns}; columns not sent keep
+-- their current value, so quantity_sold is never written from a stale copy.
+-- The targeted rows are locked before checking, and the UPDATE repeats the
+-- quantity_available >= quantity_sold guard, so a sale landing meanwhile
+-- cannot slip under it.
+--
+-- Returns {ticket_types} in request order, or {reason, ...} with nothing
+-- written: event_not_found, not_found (ticket_type_ids),
+-- quantity_below_sold (ticket_type_id, name, quantity_sold) or
+-- duplicate_name (name).
+
+create or replace function public.update_ticket_types_guarded(
+    p_event_id uuid,
+    p_organizer_id uuid,
+    p_updates jsonb
+)
+returns jsonb
+language plpgsql
+as $$
+declare
+    v_missing jsonb;
+    v_offender record;
+    v_duplicate text;
+    v_count int;
+    v_result jsonb;
+begin
+    perform 1 from public.events
+    where id = p_event_id and organizer_id = p_organizer_id;
+    if not found then
+        return jsonb_build_object('reason', 'event_not_found');
+    end if;
+
+    perform 1 from public.ticket_types
+    where event_id = p_event_id
+      and id in (select (u->>'id')::uuid from jsonb_array_elements(p_updates) u)
+    for update;
+
+    select jsonb_agg(u->>'id') into v_missing
+    from jsonb_array_elements(p_updates) u
+    where not exists (
+        select 1 from public.ticket_types tt
+        where tt.id = (u->>'id')::uuid and tt.event_id = p_event_id
+    );
+    if v_missing is not null then
+        return jsonb_build_object('reason', 'not_found', 'ticket_type_ids', v_missing);
+    end if;
+
+    select tt.id, tt.name, tt.quantity_sold into v_offender
+    from public.ticket_types tt
+    join jsonb_array_elements(p_updates) u on tt.id = (u->>'id')::uuid
+    where u ? 'quantity_available'
+      and (u->>'quantity_available')::int < tt.quantity_sold
+    limit 1;
+    if found then
+        return jsonb_build_object(
+            'reason', 'quantity_below_sold',
+            'ticket_type_id', v_offender.id,
+            'name', v_offender.name,
+            'quantity_sold', v_offender.quantity_sold
+        );
+    end if;
+
+    -- Names as they will be after the update, across the whole event
+    select min(f.name) into v_duplicate
+    from (
+        select coalesce(u->>'name', tt.name) as name
+        from public.ticket_types tt
+        left join jsonb_array_elements(p_updates) u on tt.id = (u->>'id')::uuid
+        where tt.event_id = p_event_id
+    ) f
+    group by lower(trim(f.name))
+    having count(*) > 1
+    limit 1;
+    if v_duplicate is not null then
+        return jsonb_build_object('reason', 'duplicate_name', 'name', v_duplicate);
+    end if;
+
+    with updated as (
+        update public.ticket_types tt
+        set name = case when u ? 'name' then u->>'name' else tt.name end,
+            description = case when u ? 'description' then u->>'description' else tt.description end,
+            price = case when u ? 'price' then (u->>'price')::numeric else tt.price end,
+            quantity_available = case when u ? 'quantity_available'
+                then (u->>'quantity_available')::int else tt.quantity_available end,
+            is_active = case when u ? 'is_active' then (u->>'is_active')::boolean else tt.is_active end,
+            updated_at = now()
+        from jsonb_array_elements(p_updates) with ordinality as r(u, ord)
+        where tt.id = (u->>'id')::uuid
+          and tt.event_id = p_event_id
+          and (not u ? 'quantity_available' or (u->>'quantity_available')::int >= tt.quantity_sold)
+        returning tt.*, r.ord
+    )
+    select count(*), jsonb_agg(to_jsonb(updated) - 'ord' order by updated.ord)
+    into v_count, v_result
+    from updated;
+
+    -- Rows are locked, so this only trips if the checks above are bypassed
+    if v_count <> jsonb_array_length(p_updates) then
+        raise exception 'ticket type guard failed for event %', p_event_id;
+    end if;
+
+    return jsonb_build_object('ticket_types', v_result);
+end;
+$$;
+
+revoke execute on function public.update_ticket_types_guarded(uuid, uuid, jsonb) from public, anon, authenticated;
+grant execute on function public.update_ticket_types_guarded(uuid, uuid, jsonb) to service_role;
@@ -0,0 +1,97 @@
+-- Single-row ticket type writes with their guards in the statement
+-- (TicketTypeService.update_ticket_type / delete_ticket_type).
+--
+-- The write only matches when the type belongs to p_event_id, the event is
+-- owned by p_organizer_id and the quantity rule holds. Only when nothing
+-- matched is the reason worked out, for _raise_guard_failure:
+-- event_not_found, not_found, quantity_below_sold or has_sales.
+
+create or replace function public.update_ticket_type_guarded(
+    p_ticket_type_id uuid,
+    p_event_id uuid,
+    p_organizer_id uuid,
+    p_updates jsonb
+)
+returns jsonb
+language plpgsql
+as $$
+declare
+    v_row public.ticket_types;
+    v_sold int;
+begin
+    update public.ticket_types tt
+    set name = case when p_updates ? 'name' then p_updates->>'name' else tt.name end,
+        description = case when p_updates ? 'description' then p_updates->>'description' else tt.description end,
+        price = case when p_updates ? 'price' then (p_updates->>'price')::numeric else tt.price end,
+        quantity_available = case when p_updates ? 'quantity_available'
+            then (p_updates->>'quantity_available')::int else tt.quantity_available end,
+        is_active = case when p_updates ? 'is_active' then (p_updates->>'is_active')::boolean else tt.is_active end,
+        updated_at = now()
+    from public.events e
+    where tt.id = p_ticket_type_id
+      and tt.event_id = p_event_id
+      and e.id = tt.event_id
+      and e.organizer_id = p_organizer_id
+      and (not p_updates ? 'quantity_available'
+           or (p_updates->>'quantity_available')::int >= tt.quantity_sold)
+    returning tt.* into v_row;
+
+    if found then
+        return jsonb_build_object('ticket_type', to_jsonb(v_row));
+    end if;
+
+    perform 1 from public.events where id = p_event_id and organizer_id = p_organizer_id;
+    if not found then
+        return jsonb_build_object('reason', 'event_not_found');
+    end if;
+
+    select quantity_sold into v_sold
+    from public.ticket_types
+    where id = p_ticket_type_id and event_id = p_event_id;
+    if not found then
+        return jsonb_build_object('reason', 'not_found');
+    end if;
+
+    return jsonb_build_object('reason', 'quantity_below_sold', 'quantity_sold', v_sold);
+end;
+$$;
+
+create or replace function public.delete_ticket_type_guarded(
+    p_ticket_type_id uuid,
+    p_event_id uuid,
+    p_organizer_id uuid
+)
+returns jsonb
+language plpgsql
+as $$
+begin
+    delete from public.ticket_types tt
+    using public.events e
+    where tt.id = p_ticket_type_id
+      and tt.event_id = p_event_id
+      and e.id = tt.event_id
+      and e.organizer_id = p_organizer_id
+      and tt.quantity_sold = 0;
+
+    if found then
+        return jsonb_build_object('deleted', true);
+    end if;
+
+    perform 1 from public.events where id = p_event_id and organizer_id = p_organizer_id;
+    if not found then
+        return jsonb_build_object('deleted', false, 'reason', 'event_not_found');
+    end if;
+
+    perform 1 from public.ticket_types where id = p_ticket_type_id and event_id = p_event_id;
+    if not found then
+        return jsonb_build_object('deleted', false, 'reason', 'not_found');
+    end if;
+
+    return jsonb_build_object('deleted', false, 'reason', 'has_sales');
+end;
+$$;
+
+revoke execute on function public.update_ticket_type_guarded(uuid, uuid, uuid, jsonb) from public, anon, authenticated;
+grant execute on function public.update_ticket_type_guarded(uuid, uuid, uuid, jsonb) to service_role;
+revoke execute on function public.delete_ticket_type_guarded(uuid, uuid, uuid) from public, anon, authenticated;
+grant execute on function public.delete_ticket_type_guarded(uuid, uuid, uuid) to service_role;
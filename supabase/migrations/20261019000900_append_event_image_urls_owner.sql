@@ -0,0 +1,31 @@
+-- append_event_image_urls now takes the organizer and only appends to an
+-- event that organizer owns, returning null otherwise. The upload and
+-- confirm routes rely on it as their ownership check instead of a separate
+-- read before the write.
+
+drop function if exists public.append_event_image_urls(uuid, text[]);
+
+create or replace function public.append_event_image_urls(
+    p_event_id uuid,
+    p_organizer_id uuid,
+    p_urls text[]
+)
+returns text[]
+language sql
+as $$
+    update public.events e
+    set image_urls = coalesce(e.image_urls, '{}') || array(
+            select u.url
+            from unnest(p_urls) with ordinality as u(url, ord)
+            where not (u.url = any(coalesce(e.image_urls, '{}')))
+            group by u.url
+            order by min(u.ord)
+        ),
+        updated_at = now()
+    where e.id = p_event_id
+      and e.organizer_id = p_organizer_id
+    returning e.image_urls
+$$;
+
+revoke execute on function public.append_event_image_urls(uuid, uuid, text[]) from public, anon, authenticated;
+grant execute on function public.append_event_image_urls(uuid, uuid, text[]) to service_role;
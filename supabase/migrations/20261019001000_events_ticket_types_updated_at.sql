@@ -0,0 +1,21 @@
+-- events.updated_at and ticket_types.updated_at feed the ETags served by
+-- GET /events, GET /events/{id} and GET .../ticket-types. Stamping them in
+-- a trigger means every write bumps the tag: PATCHes, the guarded ticket
+-- type RPCs, adjust_ticket_types_sold, the image append/remove RPCs,
+-- merge_event_image_variants and any write made outside this service.
+-- Without it a write that forgot the column let 304s serve stale bodies.
+
+alter table public.events
+    add column if not exists updated_at timestamptz not null default now();
+alter table public.ticket_types
+    add column if not exists updated_at timestamptz not null default now();
+
+drop trigger if exists events_set_updated_at on public.events;
+create trigger events_set_updated_at
+    before insert or update on public.events
+    for each row execute function public.set_updated_at();
+
+drop trigger if exists ticket_types_set_updated_at on public.ticket_types;
+create trigger ticket_types_set_updated_at
+    before insert or update on public.ticket_types
+    for each row execute function public.set_updated_at();
@@ -0,0 +1,43 @@
+-- Progress rows for background bulk jobs (JobService), so a poll landing on
+-- another worker still finds the job, and the per-type quantity_sold
+-- adjustment used by bulk cancellation and guest-list imports.
+
+create table if not exists public.bulk_jobs (
+    id uuid primary key,
+    organizer_id uuid not null,
+    event_id uuid not null,
+    kind text not null,
+    status text not null,
+    total integer,
+    processed integer not null default 0,
+    failed integer not null default 0,
+    error text,
+    created_at timestamptz not null default now(),
+    updated_at timestamptz not null default now(),
+    finished_at timestamptz
+);
+
+create index if not exists bulk_jobs_organizer_created_idx
+    on public.bulk_jobs (organizer_id, created_at desc);
+
+alter table public.bulk_jobs enable row level security;
+
+-- p_deltas maps ticket type name to a signed change. Every type moves in one
+-- UPDATE ... FROM jsonb_each, relative to the current value, so concurrent
+-- sales are never overwritten.
+create or replace function public.adjust_ticket_types_sold(
+    p_event_id uuid,
+    p_deltas jsonb
+)
+returns void
+language sql
+as $$
+    update public.ticket_types tt
+    set quantity_sold = greatest(tt.quantity_sold + d.value::int, 0)
+    from jsonb_each_text(p_deltas) d
+    where tt.event_id = p_event_id
+      and tt.name = d.key
+$$;
+
+revoke execute on function public.adjust_ticket_types_sold(uuid, jsonb) from public, anon, authenticated;
+grant execute on function public.adjust_ticket_types_sold(uuid, jsonb) to service_role;
@@ -0,0 +1,67 @@
+-- All-or-nothing quantity_sold reservation for guest-list imports
+-- (TicketTypeService.reserve_quantities). p_counts maps ticket type name to
+-- the number of tickets about to be inserted.
+--
+-- The types are locked, checked against quantity_available and incremented
+-- in one call, so comps can never push a type past its inventory, even
+-- while sales are running. Returns {reserved: true}, or {reserved: false,
+-- reason} with nothing written: insufficient (name, remaining, requested)
+-- or not_found.
+
+create or replace function public.reserve_ticket_type_quantities(
+    p_event_id uuid,
+    p_counts jsonb
+)
+returns jsonb
+language plpgsql
+as $$
+declare
+    v_short record;
+    v_found int;
+begin
+    -- Stable lock order so concurrent reservations cannot deadlock
+    perform 1 from public.ticket_types
+    where event_id = p_event_id
+      and name in (select key from jsonb_each_text(p_counts))
+    order by id
+    for update;
+
+    select count(*) into v_found
+    from public.ticket_types tt
+    join jsonb_each_text(p_counts) c on c.key = tt.name
+    where tt.event_id = p_event_id;
+    if v_found <> (select count(*) from jsonb_object_keys(p_counts)) then
+        return jsonb_build_object('reserved', false, 'reason', 'not_found');
+    end if;
+
+    select tt.name,
+           tt.quantity_available - tt.quantity_sold as remaining,
+           c.value::int as requested
+    into v_short
+    from public.ticket_types tt
+    join jsonb_each_text(p_counts) c on c.key = tt.name
+    where tt.event_id = p_event_id
+      and tt.quantity_sold + c.value::int > tt.quantity_available
+    limit 1;
+    if found then
+        return jsonb_build_object(
+            'reserved', false,
+            'reason', 'insufficient',
+            'name', v_short.name,
+            'remaining', greatest(v_short.remaining, 0),
+            'requested', v_short.requested
+        );
+    end if;
+
+    update public.ticket_types tt
+    set quantity_sold = tt.quantity_sold + c.value::int
+    from jsonb_each_text(p_counts) c
+    where tt.event_id = p_event_id
+      and tt.name = c.key;
+
+    return jsonb_build_object('reserved', true);
+end;
+$$;
+
+revoke execute on function public.reserve_ticket_type_quantities(uuid, jsonb) from public, anon, authenticated;
+grant execute on function public.reserve_ticket_type_quantities(uuid, jsonb) to service_role;
@@ -0,0 +1,48 @@
+-- Per-event ticket and revenue totals for an organizer's dashboard
+-- (EventService.get_organizer_stats / get_revenue_breakdown).
+--
+-- Counting happens here so the response stays one entry per event however
+-- many tickets and orders the organizer has sold; raw rows read through
+-- PostgREST are silently truncated at max-rows. Returns
+-- {events: [{event_id, tickets_sold, revenue}], active_attendees}, where
+-- active_attendees counts distinct emails across all of the organizer's events.
+
+create or replace function public.organizer_dashboard_totals(p_organizer_id uuid)
+returns jsonb
+language sql
+stable
+as $$
+    select jsonb_build_object(
+        'events', coalesce((
+            select jsonb_agg(jsonb_build_object(
+                'event_id', e.id,
+                'tickets_sold', (
+                    select count(*)
+                    from public.tickets t
+                    where t.event_id = e.id
+                      and t.status is distinct from 'cancelled'
+                ),
+                'revenue', coalesce((
+                    select sum(o.amount)
+                    from public.orders o
+                    where o.event_id = e.id and o.status = 'paid'
+                ), 0)
+            ))
+            from public.events e
+            where e.organizer_id = p_organizer_id
+        ), '[]'::jsonb),
+        'active_attendees', (
+            select count(distinct nullif(t.customer_email, ''))
+            from public.tickets t
+            join public.events e on e.id = t.event_id
+            where e.organizer_id = p_organizer_id
+              and t.status is distinct from 'cancelled'
+        )
+    )
+$$;
+
+create index if not exists events_organizer_idx
+    on public.events (organizer_id);
+
+revoke execute on function public.organizer_dashboard_totals(uuid) from public, anon, authenticated;
+grant execute on function public.organizer_dashboard_totals(uuid) to service_role;
@@ -0,0 +1,155 @@
+"""Shared fixtures: a stand-in Supabase client and DEBUG projection checks.
+
+The stand-in answers every query with rows holding exactly the columns named
+in its select string (embeds included), so a service reading a column it did
+not project trips the DEBUG guard in app.utils.projections.
+"""
+import sys
+import types
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+EVENT_ID = "11111111-1111-1111-1111-111111111111"
+ORGANIZER_ID = "22222222-2222-2222-2222-222222222222"
+TICKET_ID = "33333333-3333-3333-3333-333333333333"
+ORDER_ID = "44444444-4444-4444-4444-444444444444"
+TIMESTAMP = "2026-10-19T10:00:00+00:00"
+
+# Embeds that PostgREST returns as a list (one-to-many); others are objects
+TO_MANY_EMBEDS = {"tickets"}
+
+
+def split_select(select: str) -> List[str]:
+    """Split a select string on top-level commas only."""
+    parts, depth, current = [], 0, ""
+    for char in select:
+        if char == "," and depth == 0:
+            parts.append(current.strip())
+            current = ""
+            continue
+        depth += char == "("
+        depth -= char == ")"
+        current += char
+    if current.strip():
+        parts.append(current.strip())
+    return parts
+
+
+class FakeClient:
+    """Minimal chainable stand-in for the sync supabase-py client."""
+
+    def __init__(self):
+        # Per-table column overrides, e.g. {"tickets": {"status": "used"}}
+        self.values: Dict[str, Dict[str, Any]] = {}
+        self.selects: List[str] = []
+
+    def table(self, name: str) -> "FakeQuery":
+        return FakeQuery(self, name)
+
+    def rpc(self, name: str, params: Dict[str, Any]) -> "FakeQuery":
+        return FakeQuery(self, name)
+
+    def value(self, table: str, column: str) -> Any:
+        if column in self.values.get(table, {}):
+            return self.values[table][column]
+        if column == "id":
+            return {"events": EVENT_ID, "orders": ORDER_ID}.get(table, TICKET_ID)
+        if column == "event_id":
+            return EVENT_ID
+        if column == "organizer_id":
+            return ORGANIZER_ID
+        if column == "order_id":
+            return ORDER_ID
+        if column.endswith("_at") or column.endswith("_date"):
+            return TIMESTAMP
+        if column in ("quantity", "capacity", "quantity_available", "quantity_sold"):
+            return 10
+        if column in ("price", "amount", "ticket_price"):
+            return 25.0
+        if column == "status":
+            return "paid" if table == "orders" else "active"
+        if column == "image_urls":
+            return []
+        if column == "image_variants":
+            return {}
+        return f"{table}-{column}"
+
+    def build_row(self, table: str, select: str) -> Dict[str, Any]:
+        row: Dict[str, Any] = {}
+        for part in split_select(select):
+            if "(" in part:
+                spec, inner = part.split("(", 1)
+                embed = spec.split("!")[0].strip()
+                nested = self.build_row(embed, inner[:-1])
+                row[embed] = [nested] if embed in TO_MANY_EMBEDS else nested
+            else:
+                row[part] = self.value(table, part)
+        return row
+
+
+class FakeResponse:
+    def __init__(self, data: Any, count: Optional[int] = None):
+        self.data = data
+        self.count = count
+
+
+class FakeQuery:
+    def __init__(self, client: FakeClient, table: str):
+        self.client = client
+        self.table = table
+        self.columns: Optional[str] = None
+        self.count: Optional[str] = None
+        self.is_single = False
+        self.after_id: Optional[str] = None
+
+    def select(self, columns: str = "*", count: Optional[str] = None) -> "FakeQuery":
+        self.columns = columns
+        self.count = count
+        self.client.selects.append(columns)
+        return self
+
+    def single(self) -> "FakeQuery":
+        self.is_single = True
+        return self
+
+    def gt(self, column: str, value: Any) -> "FakeQuery":
+        # Keyset paging: the single stand-in row sorts before any cursor
+        if column == "id":
+            self.after_id = value
+        return self
+
+    def __getattr__(self, name: str):
+        # Filters, ordering and write builders only narrow or shape the query
+        return lambda *args, **kwargs: self
+
+    def execute(self) -> FakeResponse:
+        if self.columns is None or self.after_id is not None:
+            return FakeResponse(None if self.is_single else [])
+        row = self.client.build_row(self.table, self.columns)
+        if self.is_single:
+            return FakeResponse(row)
+        return FakeResponse([row], 1 if self.count else None)
+
+
+_client = FakeClient()
+
+# Services bind the client at import time, so swap the module in before them
+_module = types.ModuleType("app.core.supabase")
+_module.supabase = _client
+_module.supabase_admin = _client
+sys.modules["app.core.supabase"] = _module
+
+
+@pytest.fixture
+def client():
+    _client.values = {}
+    _client.selects = []
+    return _client
+
+
+@pytest.fixture(autouse=True)
+def debug_projections(monkeypatch):
+    """Run every test with the projection guard switched on."""
+    from app.core.config import settings
+    monkeypatch.setattr(settings, "DEBUG", True)
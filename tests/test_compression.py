@@ -0,0 +1,37 @@
+"""Encoding negotiation and validators on compressed responses."""
+from starlette.applications import Starlette
+from starlette.responses import Response
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.core.compression import CompressionMiddleware, choose_encoding
+
+
+ETAG = '"abc123"'
+
+
+def _client(body: bytes) -> TestClient:
+    async def endpoint(request):
+        return Response(body, media_type="application/json", headers={"ETag": ETAG})
+
+    app = Starlette(routes=[Route("/", endpoint)])
+    app.add_middleware(CompressionMiddleware, minimum_size=100)
+    return TestClient(app)
+
+
+def test_choose_encoding_prefers_highest_q():
+    assert choose_encoding("br;q=0.1, gzip;q=0.9") == "gzip"
+    assert choose_encoding("gzip, br") == "br"
+    assert choose_encoding("br;q=0") is None
+
+
+def test_compressed_response_gets_weak_etag():
+    response = _client(b"x" * 1000).get("/", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == f"W/{ETAG}"
+
+
+def test_uncompressed_response_keeps_strong_etag():
+    response = _client(b"x" * 10).get("/", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.headers["etag"] == ETAG
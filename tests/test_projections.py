@@ -0,0 +1,88 @@
+"""Every projected service method only reads the columns it selects.
+
+The stand-in client returns exactly the projected columns and DEBUG is on,
+so reading anything else raises KeyError from ProjectedRow.
+"""
+import pytest
+
+from app.services.event_service import EventService, EVENT_OWNER_PROJECTION
+from app.services.gate_lookup_service import GateLookupService, _indexes
+from app.services.scan_service import ScanService
+from app.services.scanner_service import ScannerService
+from app.services.ticket_service import SalesService
+from app.utils.projections import Projection, ProjectedRow
+
+from conftest import EVENT_ID, ORGANIZER_ID, TICKET_ID
+
+
+@pytest.mark.parametrize("ticket_status", ["active", "used", "cancelled"])
+def test_scan_ticket(client, ticket_status):
+    client.values = {"tickets": {"status": ticket_status}}
+    result = ScanService.scan_ticket(EVENT_ID, TICKET_ID, ORGANIZER_ID)
+    assert result["ticket_id"] == TICKET_ID
+
+
+def test_get_event_orders(client):
+    result = ScanService.get_event_orders(EVENT_ID, ORGANIZER_ID)
+    assert result["total"] == 1
+    assert result["orders"][0]["ticket_type"] == "ticket_types-name"
+
+
+def test_search_orders(client):
+    result = ScanService.search_orders(ORGANIZER_ID, reference="ORD-1")
+    assert result["orders"][0]["event_title"] == "events-title"
+
+
+def test_get_all_tickets(client):
+    result = ScanService.get_all_tickets(ORGANIZER_ID, event_id=EVENT_ID, limit=10)
+    assert result["tickets"][0]["event_title"] == "events-title"
+
+
+def test_get_ticket_by_id(client):
+    result = ScanService.get_ticket_by_id(TICKET_ID, ORGANIZER_ID)
+    assert result["id"] == TICKET_ID
+
+
+def test_get_tickets_batch(client):
+    result = ScanService.get_tickets_batch([TICKET_ID], ORGANIZER_ID)
+    assert result["missing_ticket_ids"] == []
+
+
+def test_get_event_checkins(client):
+    result = ScannerService.get_event_checkins(EVENT_ID, ORGANIZER_ID)
+    assert result[0]["ticket_code"] == "tickets-ticket_code"
+
+
+def test_event_reads(client):
+    assert EventService.get_event_by_id_with_auth(EVENT_ID, ORGANIZER_ID)["id"] == EVENT_ID
+    assert EventService.get_organizer_events(ORGANIZER_ID)[0]["organizer_id"] == ORGANIZER_ID
+    EventService.verify_event_ownership(EVENT_ID, ORGANIZER_ID)
+    assert "id, organizer_id" in client.selects
+
+
+def test_sales_reports(client):
+    report = SalesService.get_event_sales_report(EVENT_ID, ORGANIZER_ID)
+    assert report["total_tickets_sold"] == 1
+    assert SalesService.get_all_sales_reports(ORGANIZER_ID)[0]["event_id"] == EVENT_ID
+
+
+def test_gate_lookup(client):
+    _indexes.clear()
+    GateLookupService.start_session(EVENT_ID, ORGANIZER_ID)
+    GateLookupService._refresh(_indexes[EVENT_ID])
+    result = GateLookupService.lookup(EVENT_ID, ORGANIZER_ID, "tickets-customer")
+    assert result["results"][0]["order_reference"] == "orders-reference"
+
+
+def test_unprojected_read_raises():
+    row = EVENT_OWNER_PROJECTION.row({"id": EVENT_ID, "organizer_id": ORGANIZER_ID})
+    assert isinstance(row, ProjectedRow)
+    with pytest.raises(KeyError, match="not projected"):
+        row.get("title")
+
+
+def test_unprojected_embed_read_raises():
+    projection = Projection("id", embeds={"events!inner": Projection("title")})
+    row = projection.row({"id": TICKET_ID, "events": {"title": "Gala"}})
+    with pytest.raises(KeyError, match="not projected"):
+        row["events"]["organizer_id"]